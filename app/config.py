@@ -1,25 +1,44 @@
 # app/config.py
 from __future__ import annotations
 
+import functools
+import logging
 import os
 import re
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Final, FrozenSet, Iterable, List, Mapping, Optional, Tuple
 
 import yaml  # type: ignore[import]
-from pydantic import BaseModel, ConfigDict, Field
+
+logger = logging.getLogger("market_insights.config")
+
+_REPO_ROOT: Final = Path(__file__).resolve().parents[1]
 
 _X = re.compile(r"\$\{([^}]+)\}")
 
+# Prefer the libyaml-backed loader; fall back to the pure-Python one.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", None)
+if _YAML_LOADER is None:
+    logger.warning(
+        "PyYAML C bindings unavailable; falling back to the pure-Python SafeLoader "
+        "(install libyaml for faster config parsing)"
+    )
+    _YAML_LOADER = yaml.SafeLoader
 
-def _expand_env(value: Any) -> Any:
-    if isinstance(value, str):
 
-        def repl(m: re.Match) -> str:
-            var = m.group(1)
-            return os.environ.get(var, "")
+def _load_yaml(path: Path) -> Dict[str, Any]:
+    return yaml.load(path.read_text("utf-8"), Loader=_YAML_LOADER) or {}
 
-        return _X.sub(repl, value)
+
+def _expand_env(value: Any) -> Any:
+    if isinstance(value, str):
+        if "${" not in value:
+            return value
+        env = os.environ
+        # Resolve each distinct placeholder once, then substitute from the map.
+        values = {name: env.get(name, "") for name in set(_X.findall(value))}
+        return _X.sub(lambda m: values[m.group(1)], value)
     if isinstance(value, dict):
         return {k: _expand_env(v) for k, v in value.items()}
     if isinstance(value, list):
@@ -27,87 +46,269 @@ def _expand_env(value: Any) -> Any:
     return value
 
 
-def _deep_merge(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
-    out = dict(a)
+def _deep_merge_inplace(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge ``b`` into ``a`` recursively, mutating and returning ``a``."""
     for k, v in b.items():
-        if k in out and isinstance(out[k], dict) and isinstance(v, dict):
-            out[k] = _deep_merge(out[k], v)
+        av = a.get(k)
+        if isinstance(av, dict) and isinstance(v, dict):
+            _deep_merge_inplace(av, v)
         else:
-            out[k] = v
-    return out
+            a[k] = v
+    return a
 
 
+@functools.lru_cache(maxsize=1)
 def _load_config_dict() -> Dict[str, Any]:
-    repo_root = Path(__file__).resolve().parents[1]
-    default_p = repo_root / "config.example.yaml"
-    user_p = repo_root / "config.yaml"
+    default_p = _REPO_ROOT / "config.example.yaml"
+    user_p = _REPO_ROOT / "config.yaml"
     base: Dict[str, Any] = {}
     if default_p.exists():
-        base = yaml.safe_load(default_p.read_text("utf-8")) or {}
+        base = _load_yaml(default_p)
     user: Dict[str, Any] = {}
     if user_p.exists():
-        user = yaml.safe_load(user_p.read_text("utf-8")) or {}
-    merged = _deep_merge(base, user)
+        user = _load_yaml(user_p)
+    merged = _deep_merge_inplace(base, user)
     return _expand_env(merged)
 
 
-class MassiveProviderSettings(BaseModel):
-    """Settings for the Massive market data provider."""
+_TRUE_STRINGS = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE_STRINGS = frozenset({"0", "false", "f", "no", "n", "off"})
+_UNSET: Any = object()
+
+
+def _section(data: Any, name: str) -> Dict[str, Any]:
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{name} must be a mapping")
+    return data
+
+
+def _as_bool(value: Any, name: str) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+    raise ValueError(f"{name} must be a boolean")
+
+
+def _as_float(value: Any, name: str) -> float:
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be a number")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number") from None
+
 
-    model_config = ConfigDict(extra="allow")
+def _as_int(value: Any, name: str) -> int:
+    number = _as_float(value, name)
+    if not number.is_integer():
+        raise ValueError(f"{name} must be an integer")
+    return int(number)
+
+
+def _as_str_list(value: Any, name: str) -> List[str]:
+    if not isinstance(value, (list, tuple)) or not all(
+        isinstance(item, str) for item in value
+    ):
+        raise ValueError(f"{name} must be a list of strings")
+    return list(value)
+
+
+@dataclass(slots=True)
+class MassiveProviderSettings:
+    """Settings for the Massive market data provider."""
 
     enabled: bool = True
-    api_key_env: str = Field(default="MASSIVE_API_KEY", min_length=1)
+    api_key_env: str = "MASSIVE_API_KEY"
     base_url: str = "https://api.massive.com"
-    timeout: float = Field(default=10.0, gt=0)
-    retries: int = Field(default=3, ge=0)
-    equity_universe: List[str] = Field(default_factory=list)
-
-    def model_post_init(self, __context: Any) -> None:
+    timeout: float = 10.0
+    retries: int = 3
+    requests_per_minute: Optional[float] = None
+    equity_universe: List[str] = field(default_factory=list)
+    extra: Dict[str, Any] = field(default_factory=dict)
+    _api_key: Any = field(default=_UNSET, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "MassiveProviderSettings":
+        raw = dict(_section(data, "providers.massive"))
+        prefix = "providers.massive."
+        settings = cls()
+        if "enabled" in raw:
+            settings.enabled = _as_bool(raw.pop("enabled"), prefix + "enabled")
+        if "api_key_env" in raw:
+            api_key_env = raw.pop("api_key_env")
+            if not isinstance(api_key_env, str) or not api_key_env:
+                raise ValueError(prefix + "api_key_env must be a non-empty string")
+            settings.api_key_env = api_key_env
+        if "base_url" in raw:
+            settings.base_url = str(raw.pop("base_url"))
+        if "timeout" in raw:
+            settings.timeout = _as_float(raw.pop("timeout"), prefix + "timeout")
+            if settings.timeout <= 0:
+                raise ValueError(prefix + "timeout must be greater than 0")
+        if "retries" in raw:
+            settings.retries = _as_int(raw.pop("retries"), prefix + "retries")
+            if settings.retries < 0:
+                raise ValueError(prefix + "retries must be >= 0")
+        if "requests_per_minute" in raw:
+            rpm = raw.pop("requests_per_minute")
+            if rpm is not None:
+                settings.requests_per_minute = _as_float(
+                    rpm, prefix + "requests_per_minute"
+                )
+                if settings.requests_per_minute <= 0:
+                    raise ValueError(
+                        prefix + "requests_per_minute must be greater than 0"
+                    )
+        if "equity_universe" in raw:
+            settings.equity_universe = _as_str_list(
+                raw.pop("equity_universe"), prefix + "equity_universe"
+            )
+        settings.extra = raw
+
+        # Environment overrides are read once here; settings are cached per process.
         env_base = os.environ.get("MASSIVE_BASE_URL")
         if env_base:
-            self.base_url = env_base
+            settings.base_url = env_base
 
         env_timeout = os.environ.get("MASSIVE_HTTP_TIMEOUT")
         if env_timeout:
             try:
-                self.timeout = float(env_timeout)
+                settings.timeout = float(env_timeout)
             except ValueError:
                 pass
+        return settings
 
     @property
     def api_key(self) -> Optional[str]:
-        """Resolve the API key from the configured environment variable."""
-        value = os.environ.get(self.api_key_env)
-        return value or None
-
-
-class ProvidersSettings(BaseModel):
+        """Resolve the API key from the configured environment variable (cached)."""
+        if self._api_key is _UNSET:
+            self._api_key = os.environ.get(self.api_key_env) or None
+        return self._api_key
+
+    def model_dump(self, mode: str = "python") -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "api_key_env": self.api_key_env,
+            "base_url": self.base_url,
+            "timeout": self.timeout,
+            "retries": self.retries,
+            "requests_per_minute": self.requests_per_minute,
+            "equity_universe": list(self.equity_universe),
+            **self.extra,
+        }
+
+
+@dataclass(slots=True)
+class ProvidersSettings:
     """Top-level provider configuration."""
 
-    model_config = ConfigDict(extra="allow")
-
     default: str = "massive"
-    massive: MassiveProviderSettings = Field(default_factory=MassiveProviderSettings)
-
-
-class AppSettings(BaseModel):
+    massive: MassiveProviderSettings = field(default_factory=MassiveProviderSettings)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "ProvidersSettings":
+        raw = dict(_section(data, "providers"))
+        settings = cls(
+            massive=MassiveProviderSettings.from_dict(raw.pop("massive", None))
+        )
+        if "default" in raw:
+            settings.default = str(raw.pop("default"))
+        settings.extra = raw
+        return settings
+
+    def model_dump(self, mode: str = "python") -> Dict[str, Any]:
+        return {
+            "default": self.default,
+            "massive": self.massive.model_dump(mode),
+            **self.extra,
+        }
+
+
+@dataclass(slots=True)
+class AppSettings:
     """Typed representation of the application configuration."""
 
-    model_config = ConfigDict(extra="allow")
-
-    providers: ProvidersSettings = Field(default_factory=ProvidersSettings)
-
-
+    providers: ProvidersSettings = field(default_factory=ProvidersSettings)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "AppSettings":
+        raw = dict(_section(data, "config"))
+        providers = ProvidersSettings.from_dict(raw.pop("providers", None))
+        return cls(providers=providers, extra=raw)
+
+    def model_dump(self, mode: str = "python") -> Dict[str, Any]:
+        """Return the settings as a plain dict, including unmodelled sections."""
+        return {"providers": self.providers.model_dump(mode), **self.extra}
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenConfig:
+    """Flattened, read-only view of the settings consulted on request paths."""
+
+    provider_kind: str
+    use_duckdb_eod: bool
+    requests_per_minute: int
+    quotes_ttl: int
+    ohlc_ttl: int
+    vix_ttl: int
+    computed_ttl: int
+    allowed_ips: FrozenSet[str]
+    frontend_origins: Tuple[str, ...]
+
+    @classmethod
+    def from_config(
+        cls,
+        cfg: Mapping[str, Any],
+        *,
+        allowed_ips: Iterable[str] = (),
+        frontend_origins: Iterable[str] = (),
+    ) -> "FrozenConfig":
+        provider_cfg = cfg.get("provider") or {}
+        metrics_cfg = cfg.get("metrics") or {}
+        rate_cfg = cfg.get("rate_limit") or {}
+        ttl = (cfg.get("cache") or {}).get("ttl") or {}
+        return cls(
+            provider_kind=str(provider_cfg.get("kind") or "market_data").lower(),
+            use_duckdb_eod=bool(metrics_cfg.get("use_duckdb_eod")),
+            requests_per_minute=int(rate_cfg.get("requests_per_minute", 60)),
+            quotes_ttl=int(ttl.get("quotes", 15)),
+            ohlc_ttl=int(ttl.get("ohlc", 180)),
+            vix_ttl=int(ttl.get("vix", 60)),
+            computed_ttl=int(ttl.get("computed", 30)),
+            allowed_ips=frozenset(allowed_ips),
+            frontend_origins=tuple(frontend_origins),
+        )
+
+
+@functools.lru_cache(maxsize=1)
 def load_settings() -> AppSettings:
-    """Load configuration and return a typed AppSettings instance."""
+    """Load configuration and return a typed AppSettings instance.
+
+    The result is cached for the process lifetime; call
+    ``load_settings.cache_clear()`` after changing config files or env vars.
+    """
 
     raw = _load_config_dict()
-    return AppSettings.model_validate(raw)
+    return AppSettings.from_dict(raw)
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> Dict[str, Any]:
-    """Load configuration as a plain dictionary (legacy behaviour)."""
+    """Load configuration as a plain dictionary (legacy behaviour).
+
+    The returned dict is cached and shared between callers; treat it as read-only.
+    """
 
     settings = load_settings()
     return settings.model_dump(mode="python")
@@ -4,34 +4,48 @@ import sys
 from typing import Any, Dict
 
 
+# Fixed levels for framework and third-party loggers.
+_LOGGER_LEVELS = (
+    ("uvicorn", logging.INFO),
+    ("uvicorn.access", logging.INFO),
+    ("fastapi", logging.INFO),
+    # Reduce noise from external libraries
+    ("urllib3", logging.WARNING),
+    ("requests", logging.WARNING),
+)
+
+_configured = False
+
+
 def setup_logging(config: Dict[str, Any]) -> None:
-    """Configure the process-wide logging handlers and default levels."""
+    """Configure the process-wide logging handlers and default levels.
+
+    Only the first call has an effect; later calls return immediately.
+    """
+    global _configured
+    if _configured:
+        return
 
     log_config = config.get("logging", {})
     level = log_config.get("level", "INFO").upper()
+    level_int = getattr(logging, level, logging.INFO)
     format_str = log_config.get(
         "format", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
 
     # Configure root logger
     logging.basicConfig(
-        level=getattr(logging, level, logging.INFO),
+        level=level_int,
         format=format_str,
         handlers=[logging.StreamHandler(sys.stdout)],
     )
 
-    # Set specific loggers
-    logging.getLogger("uvicorn").setLevel(logging.INFO)
-    logging.getLogger("uvicorn.access").setLevel(logging.INFO)
-    logging.getLogger("fastapi").setLevel(logging.INFO)
-
-    # Reduce noise from external libraries
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("requests").setLevel(logging.WARNING)
+    for name, logger_level in _LOGGER_LEVELS:
+        logging.getLogger(name).setLevel(logger_level)
 
     # Application logger
-    app_logger = logging.getLogger("market_insights")
-    app_logger.setLevel(getattr(logging, level, logging.INFO))
+    logging.getLogger("market_insights").setLevel(level_int)
+    _configured = True
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -2,30 +2,53 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import hashlib
 import logging
+import re
+import sys
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from itertools import compress
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, cast
+from types import MappingProxyType
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Final,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
 
+import numpy as np
+import pandas as pd  # type: ignore[import]
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 # Load .env file before any config loading
-repo_root = Path(__file__).resolve().parents[1]
-env_file = repo_root / ".env"
+_REPO_ROOT: Final = Path(__file__).resolve().parents[1]
+env_file = _REPO_ROOT / ".env"
 if env_file.exists():
     load_dotenv(env_file)
 
-from app.config import load_config
+from app.config import FrozenConfig, load_config
 from app.logging_config import setup_logging
 from app.middleware import rate_limit_middleware, rate_limiter
-from app.providers import get_provider
-from app.routes.api import router as api_router
+from app.routes.api import _etag_matches, router as api_router
 from app.routes.metrics import router as metrics_router
 from app.routes.journal import router as journal_router
 from app.services import sector_snapshot
-from app.services.jobs import JobManager
-from engine.cache import CacheManager
+from engine.cache import MISSING, CacheKey, CacheManager
 from engine.providers.base import MarketData
 from app.security import SecurityManager
 
@@ -34,42 +57,85 @@ class CachedProvider:
     def __init__(self, inner: MarketData, cache: CacheManager) -> None:
         self.inner = inner
         self.cache = cache
+        # Resolved once so shutdown does not need to probe the provider.
+        self._inner_aclose = getattr(inner, "aclose", None)
+        # Upstream fetches currently running, shared by concurrent callers.
+        self._inflight: Dict[Tuple[str, CacheKey], asyncio.Task] = {}
+
+    async def _single_flight(
+        self,
+        namespace: str,
+        key: CacheKey,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+        ttl_seconds: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        value = self.cache.peek(namespace, key)
+        if value is not MISSING:
+            return value
+
+        flight_key = (namespace, key)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self.cache.cached_fetch(
+                    namespace,
+                    key,
+                    functools.partial(fn, *args, **kwargs),
+                    ttl_seconds=ttl_seconds,
+                )
+            )
+            self._inflight[flight_key] = task
+            task.add_done_callback(
+                lambda done: self._finish_flight(flight_key, done)
+            )
+        # Shielded so one cancelled caller does not cancel the shared fetch.
+        return await asyncio.shield(task)
+
+    def _finish_flight(
+        self, flight_key: Tuple[str, CacheKey], task: asyncio.Task
+    ) -> None:
+        self._inflight.pop(flight_key, None)
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every caller went away
 
     async def get_ohlc(
         self, symbol: str, *, period: str = "6mo", interval: str = "1d"
     ) -> List[Dict[str, Any]]:
-        key = f"{symbol}:{period}:{interval}"
-
-        async def fetch() -> List[Dict[str, Any]]:
-            return await self.inner.get_ohlc(
+        # Interned so repeated symbols hash and compare by identity.
+        symbol = sys.intern(symbol)
+        return cast(
+            List[Dict[str, Any]],
+            await self._single_flight(
+                "ohlc",
+                (symbol, period, interval),
+                self.inner.get_ohlc,
                 symbol,
+                ttl_seconds=self.cache.ohlc_interval_ttl.get(interval),
                 period=period,
                 interval=interval,
-            )
-
-        return cast(
-            List[Dict[str, Any]],
-            await self.cache.cached_fetch("ohlc", key, fetch),
+            ),
         )
 
     async def get_last_price(self, symbol: str) -> Optional[float]:
-        async def fetch() -> Optional[float]:
-            return await self.inner.get_last_price(symbol)
-
         return cast(
             Optional[float],
-            await self.cache.cached_fetch("quotes", symbol, fetch),
+            await self._single_flight(
+                "quotes", sys.intern(symbol), self.inner.get_last_price, symbol
+            ),
         )
 
     async def get_vix_term(self) -> Optional[Dict[str, float]]:
-        async def fetch() -> Optional[Dict[str, float]]:
-            return await self.inner.get_vix_term()
-
         return cast(
             Optional[Dict[str, float]],
-            await self.cache.cached_fetch("vix", "^VIX", fetch),
+            await self._single_flight("vix", "^VIX", self.inner.get_vix_term),
         )
 
+    async def aclose(self) -> None:
+        if self._inner_aclose is not None:
+            await self._inner_aclose()
+
     def diagnostics(self) -> Dict[str, Any]:
         provider = getattr(self, "inner", None)
         diag_func = getattr(provider, "diagnostics", None)
@@ -86,26 +152,28 @@ class CachedProvider:
         return info
 
 
-def _parse_allowed_ips(raw: Any) -> Set[str]:
-    ips: Set[str] = set()
+_SEP_RE = re.compile(r"[,;\s]+")
+
+
+def _split_tokens(raw: Any) -> List[str]:
+    """Split a string or list of strings on commas, semicolons and whitespace."""
     if isinstance(raw, str):
-        items = [raw]
+        text = raw
     elif isinstance(raw, (list, tuple, set)):
-        items = [item for item in raw if isinstance(item, str)]
+        text = " ".join(item for item in raw if isinstance(item, str))
     else:
-        items = []
+        return []
+    return [token for token in _SEP_RE.split(text) if token]
+
 
-    for item in items:
-        normalized = item.replace(";", ",")
-        for fragment in normalized.split(","):
-            for token in fragment.split():
-                token_clean = token.strip()
-                if token_clean:
-                    ips.add(token_clean)
-    return ips
+def _parse_allowed_ips(raw: Any) -> Set[str]:
+    return set(_split_tokens(raw))
 
 
 def _make_provider(cfg: Dict[str, Any]) -> CachedProvider:
+    # Deferred: the provider package pulls in the Massive SDK.
+    from app.providers import get_provider
+
     cache_cfg = cfg.get("cache", {})
     ttl = cache_cfg.get("ttl", {})
     cache = CacheManager(
@@ -113,6 +181,11 @@ def _make_provider(cfg: Dict[str, Any]) -> CachedProvider:
         ohlc_ttl=int(ttl.get("ohlc", 180)),
         vix_ttl=int(ttl.get("vix", 60)),
         computed_ttl=int(ttl.get("computed", 30)),
+        ohlc_miss_ttl=int(ttl.get("ohlc_miss", 30)),
+        ohlc_interval_ttl={
+            str(interval): int(seconds)
+            for interval, seconds in (ttl.get("ohlc_by_interval") or {}).items()
+        },
         max_size=int(cache_cfg.get("max_size", 4096)),
         persist_dir=cache_cfg.get("persist_dir") or None,
         persist_computed=bool(cache_cfg.get("persist_computed", False)),
@@ -126,30 +199,52 @@ cfg: Dict[str, Any] = load_config()
 setup_logging(cfg)
 logger = logging.getLogger("market_insights")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Build the market provider and job manager on startup; tear down on exit."""
+    owned_provider: Optional[CachedProvider] = None
+    if app.state.jobs is None:
+        # Deferred: the job manager pulls in boto3 and the EOD snapshot job.
+        from app.services.jobs import JobManager
+
+        app.state.jobs = JobManager(sector_snapshot.SNAPSHOT_DB)
+    if app.state.market is None:
+        # Provider construction (SDK import, HTTP pool) and the job tables'
+        # DuckDB setup are independent, so run them side by side off the loop.
+        owned_provider, _ = await asyncio.gather(
+            asyncio.to_thread(_make_provider, cfg), app.state.jobs.start()
+        )
+        app.state.market = owned_provider
+        app.state.cache = owned_provider.cache
+    else:
+        await app.state.jobs.start()
+    logger.info("Market Insights API started successfully")
+    logger.info("Rate limit: %s requests per minute", requests_per_minute)
+    logger.info("API documentation available at /docs")
+
+    yield
+
+    jobs = getattr(app.state, "jobs", None)
+    if jobs is not None:
+        await jobs.stop()
+    if owned_provider is not None:
+        await owned_provider.aclose()
+
+
 app = FastAPI(
     title="Market Insights API",
     description="Financial market analysis and stock screening API",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Security configuration
 security_cfg = cfg.get("security", {})
 frontend_origin_cfg = security_cfg.get("frontend_origin")
-frontend_origins: List[str] = []
-if isinstance(frontend_origin_cfg, str):
-    frontend_origins = [
-        origin.strip()
-        for origin in frontend_origin_cfg.split(",")
-        if origin.strip()
-    ]
-elif isinstance(frontend_origin_cfg, (list, tuple, set)):
-    for origin in frontend_origin_cfg:
-        if isinstance(origin, str):
-            trimmed = origin.strip()
-            if trimmed:
-                frontend_origins.append(trimmed)
+frontend_origins: List[str] = _split_tokens(frontend_origin_cfg)
 
 if not frontend_origins:
     frontend_origins = ["http://localhost:5173"]
@@ -186,11 +281,15 @@ rate_limiter.requests_per_minute = requests_per_minute
 # Add rate limiting middleware
 app.middleware("http")(rate_limit_middleware)
 
-# Bind shared objects on app.state
-app.state.config = cfg
-app.state.market = _make_provider(cfg)
-app.state.cache = app.state.market.cache
-app.state.jobs: Optional[JobManager] = None
+# Bind shared objects on app.state; the provider and job manager are
+# constructed by the lifespan handler once the ASGI server starts.
+app.state.config = MappingProxyType(cfg)
+app.state.config_frozen = FrozenConfig.from_config(
+    cfg, allowed_ips=allowed_ips, frontend_origins=frontend_origins
+)
+app.state.market = None
+app.state.cache = None
+app.state.jobs = None
 
 logger.info("Market Insights API starting up...")
 
@@ -201,46 +300,103 @@ app.include_router(journal_router)
 # Chart routes removed - frontend uses /stock/{symbol} endpoint instead
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Log startup information."""
-    if app.state.jobs is None:
-        app.state.jobs = JobManager(sector_snapshot.SNAPSHOT_DB)
-    await app.state.jobs.start()
-    logger.info("Market Insights API started successfully")
-    logger.info(f"Rate limit: {requests_per_minute} requests per minute")
-    logger.info("API documentation available at /docs")
+def _float_array(values: Sequence[Any]) -> np.ndarray:
+    """Coerce a column of raw values to float64; unparseable entries become NaN."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        coerced = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+        return coerced.to_numpy(dtype=np.float64, na_value=np.nan)
 
 
-@app.on_event("shutdown")
-async def shutdown_event() -> None:
-    jobs: Optional[JobManager] = getattr(app.state, "jobs", None)
-    if jobs is not None:
-        await jobs.stop()
-    cached_provider: Optional[CachedProvider] = getattr(app.state, "market", None)
-    if cached_provider is not None:
-        aclose = getattr(getattr(cached_provider, "inner", None), "aclose", None)
-        if callable(aclose):
-            result = aclose()
-            if asyncio.iscoroutine(result):
-                await result
+# orjson writes these as ISO 8601, byte-for-byte what ``isoformat()`` returns.
+_ORJSON_NATIVE_TIMES: Final = frozenset({datetime, date, str})
 
 
-def _to_float(value: Any, fallback: float | None = None) -> float | None:
+def _iso_time(dt: Any) -> str:
     try:
-        if value is None:
-            return fallback
-        return float(value)
+        return dt.isoformat() if hasattr(dt, "isoformat") else str(dt)
     except Exception:
-        return fallback
+        return str(dt)
+
+
+def _normalize_ohlc(raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert provider OHLC rows into the /stock payload, dropping incomplete rows.
 
+    ``time`` values are left as ``datetime``/``date`` when orjson can serialise
+    them natively, so the result must be rendered with ``ORJSONResponse``.
+    """
+    dates = [row.get("date") for row in raw]
+    if set(map(type, dates)) <= _ORJSON_NATIVE_TIMES:
+        times: List[Any] = dates
+    else:
+        times = [_iso_time(dt) for dt in dates]
+
+    opens = _float_array([r.get("open") for r in raw])
+    highs = _float_array([r.get("high") for r in raw])
+    lows = _float_array([r.get("low") for r in raw])
+    closes = _float_array([r.get("close") for r in raw])
+    volumes = _float_array([r.get("volume") for r in raw])
+    volumes[~np.isfinite(volumes)] = 0.0
+
+    mask = (
+        np.isfinite(opens)
+        & np.isfinite(highs)
+        & np.isfinite(lows)
+        & np.isfinite(closes)
+    )
+    if not mask.all():
+        # Drop incomplete rows column-wise so the row pass below is unconditional.
+        times = list(compress(times, mask.tolist()))
+        opens, highs, lows, closes, volumes = (
+            opens[mask],
+            highs[mask],
+            lows[mask],
+            closes[mask],
+            volumes[mask],
+        )
 
-@app.get("/stock/{symbol}")
-@app.get("/api/stock/{symbol}")
+    return [
+        {"time": t, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+        for t, o, h, lo, c, v in zip(
+            times,
+            opens.tolist(),
+            highs.tolist(),
+            lows.tolist(),
+            closes.tolist(),
+            volumes.tolist(),
+        )
+    ]
+
+
+_STOCK_CACHE_CONTROL: Final = "private, max-age=30"
+
+
+def _ohlc_etag(sym: str, period: str, interval: str, raw: List[Dict[str, Any]]) -> str:
+    # The latest bar's close/volume change intraday while its date does not, so
+    # they are part of the tag alongside the row count.
+    last = raw[-1]
+    fingerprint = (
+        f"{sym}:{period}:{interval}:{len(raw)}:"
+        f"{last.get('date')}:{last.get('close')}:{last.get('volume')}"
+    )
+    digest = hashlib.blake2b(fingerprint.encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+@app.get("/stock/{symbol}", response_class=ORJSONResponse)
+@app.get("/api/stock/{symbol}", response_class=ORJSONResponse)
 async def get_stock_data(
-    symbol: str, period: str = "1mo", interval: str = "1d"
-) -> List[Dict[str, Any]]:
-    """Return OHLCV data for a symbol using the configured provider."""
+    symbol: str,
+    period: str = "1mo",
+    interval: str = "1d",
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
+    """Return OHLCV data for a symbol using the configured provider.
+
+    Rows are serialized straight to orjson, bypassing response-model validation.
+    Responses carry an ETag; a matching ``If-None-Match`` gets an empty 304.
+    """
     sym = symbol.strip().upper()
     if not sym:
         raise HTTPException(status_code=400, detail="Symbol is required")
@@ -255,53 +411,32 @@ async def get_stock_data(
         ) from exc
 
     if not raw:
-        return []
-
-    normalized: List[Dict[str, Any]] = []
-    for row in raw:
-        dt = row.get("Date") or row.get("date") or row.get("time")
-        try:
-            iso_time = dt.isoformat() if hasattr(dt, "isoformat") else str(dt)
-        except Exception:
-            iso_time = str(dt)
-
-        normalized.append(
-            {
-                "time": iso_time,
-                "open": _to_float(row.get("Open") or row.get("open")),
-                "high": _to_float(row.get("High") or row.get("high")),
-                "low": _to_float(row.get("Low") or row.get("low")),
-                "close": _to_float(row.get("Close") or row.get("close")),
-                "volume": _to_float(
-                    row.get("Volume") or row.get("volume"), fallback=0.0
-                ),
-            }
-        )
+        return ORJSONResponse([])
 
-    return [
-        r
-        for r in normalized
-        if None not in (r["open"], r["high"], r["low"], r["close"])
-    ]
+    headers = {
+        "ETag": _ohlc_etag(sym, period, interval, raw),
+        "Cache-Control": _STOCK_CACHE_CONTROL,
+    }
+    if _etag_matches(headers["ETag"], if_none_match):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(_normalize_ohlc(raw), headers=headers)
 
 
 # Debug endpoint for cache stats
-@app.get("/debug/cache")
+@app.get("/debug/cache", response_class=ORJSONResponse)
 async def cache_stats():
     c = app.state.cache
+    if c is None:
+        raise HTTPException(status_code=503, detail="Cache unavailable")
 
-    def ns_count(namespace: str) -> int:
-        prefix = f"{namespace}:"
-        cache_ns = getattr(c, namespace)
-        return sum(1 for key in cache_ns._data.keys() if key.startswith(prefix))
-
+    # Each namespace has its own AsyncTTLCache, so its length is the namespace size.
     return {
         "stats": getattr(c, "stats", {}),
         "sizes": {
-            "quotes": ns_count("quotes"),
-            "ohlc": ns_count("ohlc"),
-            "vix": ns_count("vix"),
-            "computed": ns_count("computed"),
+            "quotes": len(c.quotes),
+            "ohlc": len(c.ohlc),
+            "vix": len(c.vix),
+            "computed": len(c.computed),
         },
         "ttls": c.ttl,
     }
@@ -2,36 +2,71 @@
 from __future__ import annotations
 
 import time
-from collections import defaultdict, deque
-from typing import Dict
+from collections import OrderedDict
+from typing import List, Tuple
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
 
 class RateLimiter:
-    """Simple in-memory rate limiter."""
+    """Simple in-memory fixed-window rate limiter, sharded by client IP hash."""
 
-    def __init__(self, requests_per_minute: int = 60):
+    window_seconds = 60.0
+    gc_interval = 1024
+    shard_count = 16  # must be a power of two
+
+    def __init__(self, requests_per_minute: int = 60, max_ips: int = 16384):
         self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, deque] = defaultdict(deque)
+        self.max_ips = max_ips
+        # Per shard: client IP -> (window_start, request_count), kept in
+        # window-start order so the oldest windows are always at the front.
+        self.shards: List["OrderedDict[str, Tuple[float, int]]"] = [
+            OrderedDict() for _ in range(self.shard_count)
+        ]
+        self._shard_mask = self.shard_count - 1
+        self._shard_max_ips = max(1, max_ips // self.shard_count)
+        self._gc_counter = 0
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+    def _collect(self, index: int, now: float) -> None:
+        """Drop a shard's expired windows (run every ``gc_interval`` requests)."""
+        shard = self.shards[index]
+        cutoff = now - self.window_seconds
+        while shard and next(iter(shard.values()))[0] <= cutoff:
+            shard.popitem(last=False)
 
     def is_allowed(self, client_ip: str) -> bool:
         """Check if request is allowed for the given client IP."""
-        now = time.time()
-        minute_ago = now - 60
+        now = time.monotonic()
+        index = hash(client_ip) & self._shard_mask
+        self._gc_counter += 1
+        if self._gc_counter >= self.gc_interval:
+            self._gc_counter = 0
+            for i in range(self.shard_count):
+                self._collect(i, now)
 
-        # Clean old requests
-        client_requests = self.requests[client_ip]
-        while client_requests and client_requests[0] < minute_ago:
-            client_requests.popleft()
+        shard = self.shards[index]
+        entry = shard.get(client_ip)
+        if entry is None:
+            start, count = now, 0
+            if len(shard) >= self._shard_max_ips:
+                # Make room for the new client by evicting the oldest window
+                # (an expired one, if any); known clients never pay for this.
+                shard.popitem(last=False)
+        else:
+            start, count = entry
+            if now - start >= self.window_seconds:
+                start, count = now, 0
+                shard.move_to_end(client_ip)
 
         # Check if under limit
-        if len(client_requests) >= self.requests_per_minute:
+        if count >= self.requests_per_minute:
             return False
 
-        # Add current request
-        client_requests.append(now)
+        shard[client_ip] = (start, count + 1)
         return True
 
 
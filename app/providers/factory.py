@@ -75,11 +75,13 @@ def get_provider(config: Optional[Dict[str, Any]] = None) -> ProviderInstance:
     base_url = str(massive_cfg.get("base_url", "https://api.massive.com"))
     timeout = _coerce_float(massive_cfg.get("timeout", 10.0), 10.0)
     retries = _coerce_int(massive_cfg.get("retries", 3), 3)
+    requests_per_minute = _coerce_float(massive_cfg.get("requests_per_minute"), 0.0)
     return MassiveProvider(
         api_key,
         base_url=base_url,
         timeout=timeout,
         retries=retries,
+        requests_per_minute=requests_per_minute if requests_per_minute > 0 else None,
     )
 
 
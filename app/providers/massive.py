@@ -6,22 +6,10 @@ from typing import Any, Dict, List, Optional
 
 from engine.providers.massive_provider import MassiveMarketData
 
+# Bars use lowercase keys: date, open, high, low, close, volume, dollar_volume.
 NumericRecord = Dict[str, Any]
 
 
-def _to_app_record(bar: Dict[str, Any]) -> NumericRecord:
-    """Convert a normalised Massive bar into the shape expected by app callers."""
-    return {
-        "Date": bar.get("date"),
-        "Open": bar.get("open"),
-        "High": bar.get("high"),
-        "Low": bar.get("low"),
-        "Close": bar.get("close"),
-        "Volume": bar.get("volume"),
-        "DollarVolume": bar.get("dollar_volume"),
-    }
-
-
 class MassiveProvider:
     """Provider used by the FastAPI layer to access Massive data."""
 
@@ -32,12 +20,14 @@ class MassiveProvider:
         base_url: str = "https://api.massive.com",
         timeout: float = 10.0,
         retries: int = 3,
+        requests_per_minute: Optional[float] = None,
     ) -> None:
         self._market = MassiveMarketData(
             api_key,
             base_url=base_url,
             timeout=timeout,
             retries=retries,
+            requests_per_minute=requests_per_minute,
         )
 
     async def get_ohlc(
@@ -47,8 +37,8 @@ class MassiveProvider:
         period: str = "6mo",
         interval: str = "1d",
     ) -> List[NumericRecord]:
-        bars = await self._market.get_ohlc(symbol, period=period, interval=interval)
-        return [_to_app_record(bar) for bar in bars]
+        # The engine adapter already emits the app record shape.
+        return await self._market.get_ohlc(symbol, period=period, interval=interval)
 
     async def get_last_price(self, symbol: str) -> Optional[float]:
         return await self._market.get_last_price(symbol)
@@ -1,13 +1,26 @@
 # app/routes/api.py
 from __future__ import annotations
 
+import functools
 import json
+import logging
+import threading
 import time
-from math import isnan
-from typing import Any, Dict, List, Optional
+from math import isfinite
+from datetime import date as Date
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any, Dict, List, Optional, Sequence, Tuple
 
 import asyncio
-from fastapi import APIRouter, HTTPException, Query, Request, status
+import numpy as np
+import orjson
+import pandas as pd  # type: ignore[import]
+import pyarrow as pa  # type: ignore[import]
+import pyarrow.compute as pc  # type: ignore[import]
+import pyarrow.dataset as ds  # type: ignore[import]
+import pyarrow.parquet as pq  # type: ignore[import]
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
@@ -17,10 +30,17 @@ from app.services.sector_snapshot import (
     compute_snapshot_metadata,
 )
 from app.schemas.sector_volume import SectorIn
-from app.services.candles_duckdb import get_daily_eod, period_start
-from app.services.jobs import JobManager
+from app.services.candles_duckdb import get_daily_eod_batch, period_start
+
+if TYPE_CHECKING:
+    from app.services.jobs import JobManager
 
 router = APIRouter()
+logger = logging.getLogger("market_insights.api")
+
+# Per-call deadline for provider fetches on the request path. The SDK's own
+# socket timeouts bound a single attempt; this bounds retries and queueing too.
+_PROVIDER_TIMEOUT = 12.0
 
 
 def _job_manager(request: Request) -> JobManager:
@@ -31,9 +51,7 @@ def _job_manager(request: Request) -> JobManager:
 
 
 def _use_duckdb_eod(request: Request) -> bool:
-    cfg = getattr(request.app.state, "config", {})
-    metrics_cfg = cfg.get("metrics", {}) if isinstance(cfg, dict) else {}
-    return bool(metrics_cfg.get("use_duckdb_eod"))
+    return request.app.state.config_frozen.use_duckdb_eod
 
 
 @router.post("/tasks/dummy", status_code=status.HTTP_202_ACCEPTED)
@@ -138,51 +156,67 @@ async def create_sector(payload: SectorCreateRequest, request: Request):
 
 
 def _to_float(x) -> Optional[float]:
+    if type(x) is float:  # common case: skip the constructor and try/except
+        return x if isfinite(x) else None
+    if x is None:
+        return None
     try:
         v = float(x)
-        if isnan(v):
-            return None
-        return v
-    except Exception:
+    except (TypeError, ValueError, OverflowError):
         return None
+    return v if isfinite(v) else None
 
 
-def _extract_ohlc(records: List[Dict[str, Any]]) -> Dict[str, List[float]]:
-    closes, vols = [], []
-    for r in records:
-        c = _to_float(r.get("Close"))
-        v = _to_float(r.get("Volume"))
-        if c is not None and v is not None:
-            closes.append(c)
-            vols.append(v)
-    return {"close": closes, "vol": vols}
-
-
-def _sma(vals: List[float], window: int) -> List[Optional[float]]:
-    out, s = [], 0.0
-    for i, v in enumerate(vals):
-        s += v
-        if i >= window:
-            s -= vals[i - window]
-        out.append(s / window if i >= window - 1 else None)
+def _field_column(records: List[Dict[str, Any]], field: str) -> np.ndarray:
+    try:
+        # Filled straight from a generator: no intermediate list of values.
+        return np.fromiter(
+            (r.get(field) for r in records), dtype=np.float64, count=len(records)
+        )
+    except (TypeError, ValueError):
+        # A stray unparseable value: coerce element-wise (None becomes NaN).
+        return np.array([_to_float(r.get(field)) for r in records], dtype=np.float64)
+
+
+def _extract_ohlc(records: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Return the finite ``close``/``vol`` columns of provider records as arrays."""
+    closes = _field_column(records, "close")
+    vols = _field_column(records, "volume")
+    keep = np.isfinite(closes) & np.isfinite(vols)
+    if keep.all():
+        return {"close": closes, "vol": vols}
+    return {"close": closes[keep], "vol": vols[keep]}
+
+
+def _sma(vals: Sequence[float], window: int) -> np.ndarray:
+    """Simple moving average, NaN until ``window`` values are available."""
+    arr = np.asarray(vals, dtype=np.float64)
+    out = np.full(len(arr), np.nan)
+    if len(arr) >= window:
+        # Rolling mean as a difference of cumulative sums.
+        csum = np.empty(len(arr) + 1, dtype=np.float64)
+        csum[0] = 0.0
+        np.cumsum(arr, out=csum[1:])
+        out[window - 1 :] = (csum[window:] - csum[:-window]) / window
     return out
 
 
+@functools.lru_cache(maxsize=4)
+def _health_body(provider_kind: str) -> bytes:
+    return orjson.dumps({"status": "ok", "provider": provider_kind})
+
+
 @router.get("/healthz")
-async def healthz(request: Request):
-    provider_kind = (
-        request.app.state.config.get("provider", {}).get("kind") or "market_data"
-    ).lower()
-    return {"status": "ok", "provider": provider_kind}
+async def healthz(request: Request) -> Response:
+    # Polled by load balancers: the body is encoded once and reused.
+    body = _health_body(request.app.state.config_frozen.provider_kind)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/health")
-async def health(request: Request):
+async def health(request: Request) -> Response:
     """Liveness/health endpoint (alias of /healthz)."""
-    provider_kind = (
-        request.app.state.config.get("provider", {}).get("kind") or "market_data"
-    ).lower()
-    return {"status": "ok", "provider": provider_kind}
+    return await healthz(request)
 
 
 @router.get("/health/snapshot")
@@ -236,16 +270,24 @@ async def debug_market_data(request: Request) -> Dict[str, Any]:
 @router.get("/compass")
 async def compass(request: Request):
     md = request.app.state.market
-    spy = await md.get_ohlc("SPY", period="6mo", interval="1d")
+    try:
+        spy = await asyncio.wait_for(
+            md.get_ohlc("SPY", period="6mo", interval="1d"), _PROVIDER_TIMEOUT
+        )
+    except asyncio.TimeoutError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Market data request timed out",
+        ) from exc
     series = _extract_ohlc(spy)
     closes = series["close"]
     if len(closes) < 55:
         return {"state": "neutral", "score": 0, "reasons": ["insufficient data"]}
 
     sma50 = _sma(closes, 50)
-    last_close = closes[-1]
-    last_sma50 = sma50[-1] or 0.0
-    prev_sma50 = sma50[-2] or last_sma50
+    last_close = float(closes[-1])
+    last_sma50 = float(sma50[-1])
+    prev_sma50 = float(sma50[-2]) or last_sma50
 
     trend_score, reasons = 0, []
     if last_close > last_sma50 and last_sma50 >= prev_sma50:
@@ -257,7 +299,10 @@ async def compass(request: Request):
     else:
         reasons.append("SPY near/flat 50DMA")
 
-    vix = await md.get_vix_term()
+    try:
+        vix = await asyncio.wait_for(md.get_vix_term(), _PROVIDER_TIMEOUT)
+    except asyncio.TimeoutError:
+        vix = None
     term_score = 0
     if vix and all(k in vix for k in ["^VIX9D", "^VIX", "^VIX3M"]):
         if vix["^VIX9D"] < vix["^VIX"] < vix["^VIX3M"]:
@@ -279,73 +324,257 @@ async def compass(request: Request):
     }
 
 
+_SCREEN_LOOKBACK = 20
+
+
+def _screen_score(
+    closes: np.ndarray, vols: np.ndarray
+) -> Optional[Tuple[Dict[str, Any], float]]:
+    """Score one symbol for ``/screen`` from its close and volume arrays.
+
+    Only the array tails are read: the latest 50-day mean, the prior 20-day
+    high and the 20-day average volume. Returns None with under 20 bars.
+    """
+    n = len(closes)
+    lookback = _SCREEN_LOOKBACK
+    if n < lookback:
+        return None
+    last_close = float(closes[-1])
+    last_sma50 = float(closes[-50:].mean()) if n >= 50 else None
+    pct_above_50 = (last_close - last_sma50) / last_sma50 if last_sma50 else None
+    prior_high = float(
+        closes[-lookback - 1 : -1].max() if n > lookback else closes[:-1].max()
+    )
+    breakout20 = 1.0 if last_close > prior_high else 0.0
+    v20 = float(vols[-lookback:].mean())
+    vol_spike = (float(vols[-1]) / v20) if v20 > 0 else None
+    vol_spike_scaled = min(vol_spike, 3.0) / 3.0 if vol_spike is not None else None
+    score = 0.0
+    if pct_above_50 is not None:
+        score += 0.4 * max(pct_above_50, -0.2)
+    score += 0.4 * breakout20
+    if vol_spike_scaled is not None:
+        score += 0.2 * vol_spike_scaled
+    metrics = {
+        "last": last_close,
+        "sma50": last_sma50,
+        "pct_above_50": pct_above_50,
+        "breakout20": bool(breakout20),
+        "vol_spike": vol_spike,
+    }
+    return metrics, round(score, 6)
+
+
 @router.get("/screen")
 async def screen(request: Request, symbols: str):
     md = request.app.state.market
     use_duckdb = _use_duckdb_eod(request)
-    duckdb_start = period_start("6mo") if use_duckdb else None
-    syms = [s.strip().upper() for s in symbols.split(",") if s.strip()]
-    results: List[Dict[str, Any]] = []
-    for s in syms:
-        if use_duckdb:
-            ohlc = await asyncio.to_thread(get_daily_eod, s, duckdb_start, None)
-        else:
-            ohlc = await md.get_ohlc(s, period="6mo", interval="1d")
-        series = _extract_ohlc(ohlc)
-        closes, vols = series["close"], series["vol"]
-        n = len(closes)
-        if n < 20:
-            results.append({"symbol": s, "error": "insufficient data"})
-            continue
-        sma50 = _sma(closes, 50)
-        last_close = closes[-1]
-        last_sma50 = sma50[-1] if n >= 50 else None
-        pct_above_50 = (last_close - last_sma50) / last_sma50 if last_sma50 else None
-        lookback = 20
-        prior_high = (
-            max(closes[-lookback - 1 : -1]) if n > lookback else max(closes[:-1])
+    # Upper-case the query once, then strip each piece a single time.
+    syms = [s for s in map(str.strip, symbols.upper().split(",")) if s]
+    # Repeated symbols are fetched and scored once; each input still gets a row.
+    unique = list(dict.fromkeys(syms))
+
+    semaphore = asyncio.Semaphore(8)
+
+    async def _fetch(symbol: str) -> Optional[List[Dict[str, Any]]]:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    md.get_ohlc(symbol, period="6mo", interval="1d"),
+                    _PROVIDER_TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                return None
+
+    histories: List[Any]
+    if use_duckdb:
+        # One query for the whole list rather than a connection per symbol.
+        by_symbol = await asyncio.to_thread(
+            get_daily_eod_batch, unique, period_start("6mo"), None
         )
-        breakout20 = 1.0 if last_close > prior_high else 0.0
-        v20 = sum(vols[-lookback:]) / lookback if n >= lookback else None
-        vol_spike = (vols[-1] / v20) if v20 and v20 > 0 else None
-        vol_spike_scaled = min(vol_spike, 3.0) / 3.0 if vol_spike is not None else None
-        score = 0.0
-        if pct_above_50 is not None:
-            score += 0.4 * max(pct_above_50, -0.2)
-        score += 0.4 * breakout20
-        if vol_spike_scaled is not None:
-            score += 0.2 * vol_spike_scaled
-        results.append(
-            {
-                "symbol": s,
-                "metrics": {
-                    "last": last_close,
-                    "sma50": last_sma50,
-                    "pct_above_50": pct_above_50,
-                    "breakout20": bool(breakout20),
-                    "vol_spike": vol_spike,
-                },
-                "score": round(score, 6),
-            }
+        histories = [by_symbol[s] for s in unique]
+    else:
+        # One failing symbol is reported in its row rather than failing the screen.
+        histories = await asyncio.gather(
+            *(_fetch(s) for s in unique), return_exceptions=True
         )
+
+    rows: Dict[str, Dict[str, Any]] = {}
+    for s, ohlc in zip(unique, histories):
+        if ohlc is None:
+            rows[s] = {"symbol": s, "error": "timeout"}
+            continue
+        if isinstance(ohlc, BaseException):
+            logger.warning("screen fetch failed for %s: %s", s, ohlc)
+            rows[s] = {"symbol": s, "error": "fetch failed"}
+            continue
+        series = _extract_ohlc(ohlc)
+        scored = _screen_score(series["close"], series["vol"])
+        if scored is None:
+            rows[s] = {"symbol": s, "error": "insufficient data"}
+            continue
+        metrics, score = scored
+        rows[s] = {"symbol": s, "metrics": metrics, "score": score}
+    results = [rows[s] for s in syms]
     ranked = sorted(results, key=lambda r: r.get("score", float("-inf")), reverse=True)
     return {"results": ranked}
 
 
 # Breadth functionality removed - not needed
-_INDIVIDUAL_STOCKS_CACHE: Dict[str, Any] = {"df": None, "ts": 0.0, "etag": None}
+_INDIVIDUAL_STOCKS_CACHE: Dict[str, Any] = {
+    "table": None,
+    "date_rows": None,
+    "symbol_rows": None,
+    "signal_flags": None,
+    "ts": 0.0,
+    "etag": None,
+}
+# Serialises cold loads; hits read the cache dict without taking it. Loads
+# publish a fresh dict, so a reader never sees fields from two different loads.
+_INDIVIDUAL_STOCKS_LOCK = threading.Lock()
 
 # Breadth endpoints removed - not needed
 
+_SIGNAL_COLUMNS = (
+    "up4",
+    "dn4",
+    "up10",
+    "dn10",
+    "up25",
+    "dn25",
+    "up25m",
+    "dn25m",
+    "up50m",
+    "dn50m",
+    "up25q",
+    "dn25q",
+)
 
-def _load_individual_stocks_df():
-    """Load individual stocks parquet with caching.
-    
-    NOTE: This endpoint requires engine/out/individual_stocks.parquet to exist.
-    The Makefile target 'make individual-stocks' is currently disabled because
-    engine/jobs/ modules don't exist yet. This endpoint will return 404 until
-    the data file is generated.
+# Every column either individual-stocks endpoint reads; the parquet reader
+# skips the rest of the file's columns entirely.
+_INDIVIDUAL_STOCKS_COLUMNS = [
+    "date",
+    "symbol",
+    "close",
+    "daily_return_pct",
+    "volume",
+    "dollar_volume",
+    *_SIGNAL_COLUMNS,
+    "ret_20",
+    "ret_from_min34",
+    "ret_from_max34",
+]
+
+
+def _parse_dates(table: pa.Table) -> Tuple[pa.Table, np.ndarray]:
+    """Parse the ``date`` column once per load.
+
+    Returns the table with ``date`` as a microsecond timestamp column (read back
+    as ``datetime`` objects, which orjson serialises natively) and the dates as
+    ``datetime64[D]`` for indexing.
     """
+    parsed = pd.to_datetime(table.column("date").to_pandas())
+    # Compare on wall-clock days, as ``.dt.date`` did, for tz-aware columns too.
+    wall_clock = parsed.dt.tz_localize(None) if parsed.dt.tz else parsed
+    date_days = wall_clock.to_numpy(dtype="datetime64[D]")
+    timestamps = pa.array(parsed)
+    timestamps = timestamps.cast(pa.timestamp("us", tz=timestamps.type.tz))
+    table = table.set_column(table.schema.get_field_index("date"), "date", timestamps)
+    return table, date_days
+
+
+def _signal_mask(signal: pa.ChunkedArray) -> pa.ChunkedArray:
+    # Signals are 0/1 flags, possibly stored as bool or float; truncate as
+    # ``astype(int)`` would. Null flags give a null mask entry, which drops the row.
+    if not pa.types.is_integer(signal.type):
+        signal = pc.cast(signal, pa.int64(), safe=False)
+    return pc.greater(signal, 0)
+
+
+def _compact_individual_stocks(table: pa.Table) -> pa.Table:
+    """Narrow integer signal flags to int8 and dictionary-encode ``symbol``."""
+    for name in _SIGNAL_COLUMNS:
+        column = table.column(name)
+        if not pa.types.is_integer(column.type) or column.type == pa.int8():
+            continue
+        try:
+            narrowed = pc.cast(column, pa.int8())  # safe cast: fails if out of range
+        except pa.ArrowInvalid:
+            continue
+        table = table.set_column(table.schema.get_field_index(name), name, narrowed)
+    symbols = table.column("symbol")
+    if pa.types.is_string(symbols.type) or pa.types.is_large_string(symbols.type):
+        table = table.set_column(
+            table.schema.get_field_index("symbol"),
+            "symbol",
+            symbols.dictionary_encode(),
+        )
+    return table
+
+
+def _rows_by_key(keys: np.ndarray, valid: np.ndarray) -> Dict[Any, np.ndarray]:
+    """Map each distinct valid key to its row positions, in file order."""
+    # A stable sort groups equal keys while keeping each group in file order.
+    order = np.argsort(keys, kind="stable")
+    order = order[valid[order]]
+    distinct, starts = np.unique(keys[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+    return {
+        key: order[start:end]
+        for key, start, end in zip(distinct.tolist(), starts.tolist(), ends.tolist())
+    }
+
+
+def _symbol_rows(symbols: pa.ChunkedArray) -> Dict[str, np.ndarray]:
+    """Map each symbol to its row positions, in file order."""
+    combined = symbols.combine_chunks()  # also unifies per-chunk dictionaries
+    if not pa.types.is_dictionary(combined.type):
+        combined = combined.dictionary_encode()
+    codes = combined.indices.fill_null(-1).to_numpy()
+    names = combined.dictionary.to_pylist()
+    return {names[code]: rows for code, rows in _rows_by_key(codes, codes >= 0).items()}
+
+
+def _date_rows(date_days: np.ndarray) -> Dict[int, np.ndarray]:
+    """Map each day (as days since the epoch) to its row positions, in file order."""
+    return _rows_by_key(date_days.view(np.int64), ~np.isnat(date_days))
+
+
+def _signal_flags(table: pa.Table) -> Dict[str, np.ndarray]:
+    """Each signal column as a boolean array (null flags count as unset)."""
+    return {
+        name: _signal_mask(table.column(name)).fill_null(False).to_numpy()
+        for name in _SIGNAL_COLUMNS
+    }
+
+
+_IndividualStocks = Tuple[
+    pa.Table,
+    Dict[int, np.ndarray],
+    Dict[str, np.ndarray],
+    Dict[str, np.ndarray],
+    str,
+]
+
+
+def _cached_individual_stocks(etag: str) -> Optional[_IndividualStocks]:
+    cache = _INDIVIDUAL_STOCKS_CACHE
+    if (
+        cache.get("table") is not None
+        and cache.get("etag") == etag
+        and time.time() - float(cache.get("ts", 0.0)) < 60.0
+    ):
+        return (
+            cache["table"],
+            cache["date_rows"],
+            cache["symbol_rows"],
+            cache["signal_flags"],
+            etag,
+        )
+    return None
+
+
+def _individual_stocks_source() -> Tuple[Path, str]:
     path = Path("engine/out/individual_stocks.parquet")
     if not path.exists():
         raise HTTPException(
@@ -354,21 +583,160 @@ def _load_individual_stocks_df():
             "The 'make individual-stocks' target is currently disabled. "
             "See Makefile for details.",
         )
-
     st = path.stat()
-    etag = f"{st.st_mtime_ns}-{st.st_size}"
-    now = time.time()
-    cached = _INDIVIDUAL_STOCKS_CACHE.get("df")
-    if (
-        cached is not None
-        and _INDIVIDUAL_STOCKS_CACHE.get("etag") == etag
-        and now - float(_INDIVIDUAL_STOCKS_CACHE.get("ts", 0.0)) < 60.0
-    ):
-        return cached, etag
+    return path, f'"{st.st_mtime_ns}-{st.st_size}"'
+
 
-    df = pd.read_parquet(path, engine="pyarrow")
-    _INDIVIDUAL_STOCKS_CACHE.update({"df": df, "ts": now, "etag": etag})
-    return df, etag
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _load_individual_stocks_table() -> _IndividualStocks:
+    """Load individual stocks parquet with caching.
+
+    Returns the Arrow table, the row positions of each date and of each symbol,
+    each signal as a boolean array (all built once per load so lookups never
+    scan the whole table) and the ETag.
+
+    NOTE: This endpoint requires engine/out/individual_stocks.parquet to exist.
+    The Makefile target 'make individual-stocks' is currently disabled because
+    engine/jobs/ modules don't exist yet. This endpoint will return 404 until
+    the data file is generated.
+    """
+    global _INDIVIDUAL_STOCKS_CACHE
+
+    path, etag = _individual_stocks_source()
+    hit = _cached_individual_stocks(etag)
+    if hit is not None:
+        return hit
+
+    with _INDIVIDUAL_STOCKS_LOCK:
+        # Another request may have loaded the file while this one waited.
+        hit = _cached_individual_stocks(etag)
+        if hit is not None:
+            return hit
+        # Kept as Arrow: filters run as compute kernels and only the matching
+        # rows are ever converted to Python objects. Memory-mapped so the read
+        # goes through the OS page cache rather than a private buffer.
+        table, date_days = _parse_dates(
+            _compact_individual_stocks(
+                pq.read_table(
+                    path, columns=_INDIVIDUAL_STOCKS_COLUMNS, memory_map=True
+                )
+            )
+        )
+        date_rows = _date_rows(date_days)
+        symbol_rows = _symbol_rows(table.column("symbol"))
+        signal_flags = _signal_flags(table)
+        _INDIVIDUAL_STOCKS_CACHE = {
+            "table": table,
+            "date_rows": date_rows,
+            "symbol_rows": symbol_rows,
+            "signal_flags": signal_flags,
+            "ts": time.time(),
+            "etag": etag,
+        }
+    return table, date_rows, symbol_rows, signal_flags, etag
+
+
+def _day_predicate(date_type: pa.DataType, day: Date) -> Optional[ds.Expression]:
+    """Parquet filter selecting ``day``'s rows, on wall-clock days like the index.
+
+    Returns None for column types that cannot be compared without parsing
+    (e.g. strings).
+    """
+    field = ds.field("date")
+    if pa.types.is_date(date_type):
+        return field == pa.scalar(day).cast(date_type)
+    if pa.types.is_timestamp(date_type):
+        start, end = (
+            pd.Timestamp(d).tz_localize(date_type.tz).to_pydatetime()
+            for d in (day, day + timedelta(days=1))
+        )
+        return (field >= pa.scalar(start, date_type)) & (
+            field < pa.scalar(end, date_type)
+        )
+    return None
+
+
+def _individual_stocks_day(
+    day: Date, signal: str, limit: int, columns: List[str]
+) -> Tuple[pa.Table, str]:
+    """Return ``columns`` of up to ``limit`` rows dated ``day`` with ``signal`` set.
+
+    Served from the cached table when it is loaded: the day's row positions
+    are narrowed by the signal flags and the limit before any column is taken.
+    Otherwise the day is read with a pushed-down filter, so a cold daily query
+    only decodes the row groups that can match instead of loading the file.
+    """
+    path, etag = _individual_stocks_source()
+    hit = _cached_individual_stocks(etag)
+    if hit is None:
+        dataset = ds.dataset(path, format="parquet")
+        predicate = _day_predicate(dataset.schema.field("date").type, day)
+        if predicate is not None:
+            rows = dataset.to_table(columns=columns, filter=predicate)
+            return rows.filter(_signal_mask(rows.column(signal))).slice(0, limit), etag
+        hit = _load_individual_stocks_table()
+    table, date_rows, _, signal_flags, etag = hit
+    flags = signal_flags[signal]
+    rows = date_rows.get(int(np.datetime64(day, "D").astype(np.int64)))
+    if rows is None:
+        return table.select(columns).slice(0, 0), etag
+    return table.select(columns).take(rows[flags[rows]][:limit]), etag
+
+
+_DAILY_COLUMNS = [
+    "symbol",
+    "close",
+    "daily_return_pct",
+    "volume",
+    "dollar_volume",
+    *_SIGNAL_COLUMNS,
+]
+
+
+_ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+def _wants_arrow(accept: Optional[str]) -> bool:
+    return bool(accept) and _ARROW_STREAM in accept
+
+
+def _representation(etag: str, arrow: bool) -> Tuple[str, Dict[str, str]]:
+    """Media type and headers of a negotiated individual-stocks response.
+
+    The Arrow stream is a different representation of the same data, so it
+    gets its own ETag.
+    """
+    if arrow:
+        return _ARROW_STREAM, {"ETag": f'{etag[:-1]}-arrow"', "Vary": "Accept"}
+    return "application/json", {"ETag": etag, "Vary": "Accept"}
+
+
+def _serialise_table(table: pa.Table, arrow: bool) -> bytes:
+    """Encode ``table`` as an Arrow IPC stream, or as a JSON array of rows."""
+    if arrow:
+        # Columnar end to end: no per-cell Python objects are created.
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    return orjson.dumps(
+        table.to_pylist(), option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _individual_stocks_daily_body(
+    etag: str, day: Date, signal: str, limit: int, arrow: bool
+) -> bytes:
+    """Serialised daily response, cached per file version (``etag``)."""
+    result, _ = _individual_stocks_day(day, signal, limit, _DAILY_COLUMNS)
+    return _serialise_table(result, arrow)
 
 
 @router.get("/individual-stocks/daily")
@@ -378,10 +746,15 @@ async def individual_stocks_daily(
         "up4", description="Signal type: up4, dn4, up10, dn10, up25, dn25"
     ),
     limit: int = Query(1000, ge=1, le=10000, description="Maximum number of results"),
-):
-    """Get individual stocks for a specific date and signal type."""
-    df, etag = _load_individual_stocks_df()
-
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    accept: Annotated[Optional[str], Header()] = None,
+) -> Response:
+    """Get individual stocks for a specific date and signal type.
+
+    Clients sending ``Accept: application/vnd.apache.arrow.stream`` get the
+    rows as an Arrow IPC stream instead of JSON. A matching ``If-None-Match``
+    gets an empty 304 without touching the data.
+    """
     try:
         target_date = pd.to_datetime(date).date()
     except Exception:
@@ -389,69 +762,42 @@ async def individual_stocks_daily(
             status_code=400, detail="Invalid date format. Use YYYY-MM-DD"
         )
 
-    # Filter by date and signal
-    date_filter = pd.to_datetime(df["date"]).dt.date == target_date
-    signal_filter = df[signal].astype(int) > 0
-
-    filtered_df = df[date_filter & signal_filter]
+    arrow = _wants_arrow(accept)
+    _, etag = _individual_stocks_source()
+    media_type, headers = _representation(etag, arrow)
+    if _etag_matches(headers["ETag"], if_none_match):
+        return Response(status_code=304, headers=headers)
 
-    if filtered_df.empty:
-        return JSONResponse(content=[], headers={"ETag": etag})
-
-    # Select relevant columns and limit results
-    result_columns = [
-        "symbol",
-        "close",
-        "daily_return_pct",
-        "volume",
-        "dollar_volume",
-        "up4",
-        "dn4",
-        "up10",
-        "dn10",
-        "up25",
-        "dn25",
-        "up25m",
-        "dn25m",
-        "up50m",
-        "dn50m",
-        "up25q",
-        "dn25q",
-    ]
-
-    result_df = filtered_df[result_columns].head(limit)
-
-    # Convert to list of dicts and handle datetime serialization
-    result = result_df.to_dict("records")
-
-    # Convert datetime objects to ISO strings for JSON serialization
-    for record in result:
-        if "date" in record and pd.notna(record["date"]):
-            if hasattr(record["date"], "isoformat"):
-                record["date"] = record["date"].isoformat()
-            else:
-                record["date"] = str(record["date"])
-
-    return JSONResponse(content=result, headers={"ETag": etag})
+    body = await asyncio.to_thread(
+        _individual_stocks_daily_body, etag, target_date, signal, limit, arrow
+    )
+    return Response(content=body, media_type=media_type, headers=headers)
 
 
 @router.get("/individual-stocks/symbol")
 async def individual_stocks_symbol(
     symbol: str = Query(..., description="Stock symbol"),
     days: int = Query(30, ge=1, le=365, description="Number of recent days"),
-):
-    """Get individual stock data for a specific symbol."""
-    df, etag = _load_individual_stocks_df()
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    accept: Annotated[Optional[str], Header()] = None,
+) -> Response:
+    """Get individual stock data for a specific symbol (JSON or Arrow stream)."""
+    arrow = _wants_arrow(accept)
+    _, etag = _individual_stocks_source()
+    _, headers = _representation(etag, arrow)
+    if _etag_matches(headers["ETag"], if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    table, _, symbol_rows, _, etag = await asyncio.to_thread(
+        _load_individual_stocks_table
+    )
 
-    # Filter by symbol and get recent days
-    symbol_df = df[df["symbol"] == symbol.upper()]
+    # Look up the symbol's rows instead of scanning the whole symbol column
+    rows = symbol_rows.get(symbol.upper())
 
-    if symbol_df.empty:
+    if rows is None:
         raise HTTPException(status_code=404, detail=f"Symbol {symbol} not found")
 
-    # Get recent days
-    recent_df = symbol_df.tail(days)
-
     # Select relevant columns
     result_columns = [
         "date",
@@ -476,17 +822,8 @@ async def individual_stocks_symbol(
         "ret_from_max34",
     ]
 
-    result_df = recent_df[result_columns]
-
-    # Convert to list of dicts and handle datetime serialization
-    result = result_df.to_dict("records")
-
-    # Convert datetime objects to ISO strings for JSON serialization
-    for record in result:
-        if "date" in record and pd.notna(record["date"]):
-            if hasattr(record["date"], "isoformat"):
-                record["date"] = record["date"].isoformat()
-            else:
-                record["date"] = str(record["date"])
-
-    return JSONResponse(content=result, headers={"ETag": etag})
+    # Only the recent rows are serialised; orjson writes the dates.
+    result = table.select(result_columns).take(rows[-days:])
+    media_type, headers = _representation(etag, arrow)
+    body = _serialise_table(result, arrow)
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from typing import List
+import dataclasses
+import inspect
+from typing import Any, Callable, Dict, List, Type, TypeVar
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
 
 from app.schemas.journal import (
     DailyNoteCreateOrUpdate,
@@ -38,11 +42,56 @@ from app.services import journal as journal_service
 from app.services.journal import JournalNotFoundError
 
 
-router = APIRouter(prefix="/journal", tags=["journal"])
+# Response models are still validated and dumped by FastAPI; orjson only
+# replaces the stdlib json.dumps of the already-serialised content.
+router = APIRouter(
+    prefix="/journal", tags=["journal"], default_response_class=ORJSONResponse
+)
+
+_FiltersT = TypeVar("_FiltersT", bound=BaseModel)
+
+
+def _query_filters(model: Type[_FiltersT]) -> Callable[..., _FiltersT]:
+    """Dependency building ``model`` from the query string.
+
+    Each field becomes a ``Query`` parameter carrying the field's constraints,
+    so FastAPI validates it (and answers 422 on bad input); the model is then
+    assembled with ``model_construct`` instead of being validated a second time
+    as ``Depends(model)`` would.
+    """
+    params = []
+    for name, field in model.model_fields.items():
+        constraints: Dict[str, Any] = {}
+        for item in field.metadata:  # annotated_types.Ge(ge=1) -> {"ge": 1}
+            if dataclasses.is_dataclass(item):
+                constraints.update(dataclasses.asdict(item))
+        params.append(
+            inspect.Parameter(
+                name,
+                inspect.Parameter.KEYWORD_ONLY,
+                default=Query(field.default, **constraints),
+                annotation=field.annotation,
+            )
+        )
+
+    def dependency(**values: Any) -> _FiltersT:
+        return model.model_construct(**values)
+
+    dependency.__signature__ = inspect.Signature(params)  # type: ignore[attr-defined]
+    return dependency
+
+
+_trade_filters = _query_filters(TradeListFilters)
+_ticker_profile_filters = _query_filters(TickerProfileFilters)
+_setup_review_filters = _query_filters(SetupReviewListFilters)
+_daily_note_filters = _query_filters(DailyNoteListFilters)
+_weekly_note_filters = _query_filters(WeeklyNoteListFilters)
 
 
 @router.get("/trades", response_model=List[TradeRead])
-async def list_trades(filters: TradeListFilters = Depends()) -> List[TradeRead]:
+async def list_trades(
+    filters: TradeListFilters = Depends(_trade_filters)
+) -> List[TradeRead]:
     return journal_service.list_trades(filters)
 
 
@@ -116,7 +165,9 @@ async def list_tickers() -> List[TickerRead]:
 
 
 @router.get("/tickers/{symbol}", response_model=TickerProfile)
-async def get_ticker_profile(symbol: str, filters: TickerProfileFilters = Depends()) -> TickerProfile:
+async def get_ticker_profile(
+    symbol: str, filters: TickerProfileFilters = Depends(_ticker_profile_filters)
+) -> TickerProfile:
     try:
         return journal_service.get_ticker_profile(symbol, filters)
     except ValueError as exc:
@@ -177,7 +228,9 @@ async def delete_setup(setup_id: UUID) -> None:
 
 
 @router.get("/setup-reviews", response_model=List[SetupReviewRead])
-async def list_setup_reviews(filters: SetupReviewListFilters = Depends()) -> List[SetupReviewRead]:
+async def list_setup_reviews(
+    filters: SetupReviewListFilters = Depends(_setup_review_filters)
+) -> List[SetupReviewRead]:
     try:
         return journal_service.list_setup_reviews(filters)
     except ValueError as exc:
@@ -250,7 +303,9 @@ async def create_setup_review_screenshot(
 
 
 @router.get("/daily-notes", response_model=List[DailyNoteRead])
-async def list_daily_notes(filters: DailyNoteListFilters = Depends()) -> List[DailyNoteRead]:
+async def list_daily_notes(
+    filters: DailyNoteListFilters = Depends(_daily_note_filters)
+) -> List[DailyNoteRead]:
     return journal_service.list_daily_notes(filters)
 
 
@@ -311,7 +366,9 @@ async def detach_trade_from_daily_note(note_id: UUID, trade_id: UUID) -> None:
 
 
 @router.get("/weekly-notes", response_model=List[WeeklyNoteRead])
-async def list_weekly_notes(filters: WeeklyNoteListFilters = Depends()) -> List[WeeklyNoteRead]:
+async def list_weekly_notes(
+    filters: WeeklyNoteListFilters = Depends(_weekly_note_filters)
+) -> List[WeeklyNoteRead]:
     return journal_service.list_weekly_notes(filters)
 
 
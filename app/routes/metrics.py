@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Mapping, Optional, Set
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Set, Tuple
 
 import numpy as np
 import pandas as pd  # type: ignore[import]
@@ -119,48 +119,92 @@ def _apply_rate_headers(response: JSONResponse, headers: Mapping[str, str]) -> J
 
 
 def _close_series_from_ohlc(records: List[Dict]) -> pd.Series:
+    """Closes indexed by (tz-naive) bar date, sorted, without unusable closes.
+
+    Only the two needed fields are read from the records, straight into
+    arrays, instead of building a DataFrame of every OHLC column.
+    """
     if not records:
         return pd.Series(dtype=float)
-    df = pd.DataFrame(records)
-    # Prefer an index if already present; else use Date column
-    if "Date" in df.columns:
-        df = df.set_index("Date")
-    if hasattr(df.index, "tz"):
-        try:
-            df.index = df.index.tz_localize(None)
-        except Exception:
-            pass
-    s = df["Close"].astype(float).dropna()
-    s = s.sort_index()
+    n = len(records)
+    try:
+        closes = np.fromiter(
+            (r.get("close") for r in records), dtype=np.float64, count=n
+        )
+    except (TypeError, ValueError):
+        raw = pd.Series([r.get("close") for r in records], dtype=object)
+        closes = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=np.float64)
+    if "date" in records[0]:
+        index = pd.DatetimeIndex([r.get("date") for r in records], name="date")
+        if index.tz is not None:
+            index = index.tz_localize(None)
+    else:
+        index = pd.RangeIndex(n)
+    keep = ~np.isnan(closes)
+    s = pd.Series(closes[keep], index=index[keep], name="close", copy=False)
+    if not s.index.is_monotonic_increasing:
+        s = s.sort_index()
     return s
 
 
-def _sma(s: pd.Series, n: int) -> pd.Series:
-    return s.rolling(window=n, min_periods=n).mean()
+def _sma_tail(closes: np.ndarray, n: int) -> Tuple[Optional[float], Optional[float]]:
+    """Latest ``n``-bar SMA and its slope (% per day over the last ``n`` bars).
 
+    Both come from two tail means (the latest window and the one ``n`` bars
+    earlier) instead of a full rolling pass over the series.
+    """
+    if len(closes) < n:
+        return None, None
+    last = float(closes[-n:].mean())
+    if len(closes) < n + n:
+        return last, None
+    prev = float(closes[-n - n : -n].mean())
+    if prev == 0:
+        return last, None
+    return last, (last - prev) / prev / n
 
-def _ema(s: pd.Series, n: int) -> pd.Series:
-    return s.ewm(span=n, adjust=False).mean()
 
+def _ewm_last(values: np.ndarray, alpha: float) -> float:
+    """Last value of ``ewm(alpha=alpha, adjust=False).mean()`` over ``values``.
 
-def _slope_pct_per_day(x: pd.Series, n: int) -> Optional[float]:
-    if len(x) < n + n:
-        return None
-    x_t = x.iloc[-1]
-    x_tn = x.iloc[-1 - n]
-    if x_tn == 0 or pd.isna(x_t) or pd.isna(x_tn):
-        return None
-    return float((x_t - x_tn) / x_tn / n)
+    The recurrence starts from the first value, so its final value is a
+    weighted sum: ``(1-a)**(n-1)`` for the first value and ``a*(1-a)**k`` for
+    the value ``k`` steps before the end. One dot product replaces the
+    full-length smoothed series.
+    """
+    weights = alpha * (1.0 - alpha) ** np.arange(len(values) - 1, -1, -1)
+    weights[0] = (1.0 - alpha) ** (len(values) - 1)
+    return float(values @ weights)
 
 
 def _provider(request: Request):
     return request.app.state.market
 
 
+async def _cached_metric(
+    request: Request,
+    key: Tuple[Any, ...],
+    compute: Callable[..., Awaitable[BaseModel]],
+    *args: Any,
+) -> Dict[str, Any]:
+    """Serve a per-symbol metric DTO from the ``computed`` cache namespace.
+
+    The dumped DTO is cached, so a hit skips the OHLC fetch, the pandas work
+    and model construction; concurrent misses for a key compute it once.
+    Without a cache (tests, or before startup) the metric is computed directly.
+    """
+
+    async def _dump() -> Dict[str, Any]:
+        return (await compute(*args)).model_dump()
+
+    cache = getattr(request.app.state, "cache", None)
+    if cache is None:
+        return await _dump()
+    return await cache.cached_fetch("computed", key, _dump)
+
+
 def _use_duckdb_eod(request: Request) -> bool:
-    cfg = getattr(request.app.state, "config", {})
-    metrics_cfg = cfg.get("metrics", {}) if isinstance(cfg, dict) else {}
-    return bool(metrics_cfg.get("use_duckdb_eod"))
+    return request.app.state.config_frozen.use_duckdb_eod
 
 
 async def _fetch_ohlc(
@@ -279,16 +323,12 @@ async def _compute_trend_lite(request: Request, provider, symbol: str) -> TrendL
     else:
         as_of = str(as_of_raw)
 
+    closes = series.to_numpy()
+
     def _last_sma(window: int) -> Optional[float]:
-        if len(series) < window:
-            return None
-        sm = _sma(series, window)
-        if sm.empty:
+        if len(closes) < window:
             return None
-        value = sm.iloc[-1]
-        if np.isnan(value):
-            return None
-        return float(value)
+        return float(closes[-window:].mean())
 
     sma10 = _last_sma(10)
     sma20 = _last_sma(20)
@@ -493,12 +533,7 @@ async def sectors_ralph(request: Request):
         rate_headers,
     )
 
-@router.get("/trend", response_model=TrendDTO)
-async def trend(
-    request: Request,
-    symbol: str = Query(..., min_length=1),
-    provider=Depends(_provider),
-):
+async def _trend(request: Request, provider, symbol: str) -> TrendDTO:
     # Need ~200 trading days
     ohlc = await _fetch_ohlc(request, provider, symbol, period="2y", interval="1d")
     s = _close_series_from_ohlc(ohlc)
@@ -522,53 +557,50 @@ async def trend(
             above50=None,
             above200=None,
         )
-    sma10 = _sma(s, 10)
-    sma20 = _sma(s, 20)
-    sma50 = _sma(s, 50)
-    sma200 = _sma(s, 200)
-    ema9 = _ema(s, 9)
-    ema21 = _ema(s, 21)
-    price = float(s.iloc[-1])
-    prev_close = float(s.iloc[-2]) if len(s) >= 2 else None
+    closes = s.to_numpy()
+    sma10, slope10 = _sma_tail(closes, 10)
+    sma20, slope20 = _sma_tail(closes, 20)
+    sma50, slope50 = _sma_tail(closes, 50)
+    sma200, slope200 = _sma_tail(closes, 200)
+    price = float(closes[-1])
+    prev_close = float(closes[-2]) if len(closes) >= 2 else None
+
+    def _above(sma_value: Optional[float]) -> bool:
+        return sma_value is not None and price > sma_value
+
     dto = TrendDTO(
         symbol=symbol.upper(),
         as_of=s.index[-1].date().isoformat(),
         price=price,
         prev_close=prev_close,
-        sma10=float(sma10.iloc[-1]) if not np.isnan(sma10.iloc[-1]) else None,
-        sma20=float(sma20.iloc[-1]) if not np.isnan(sma20.iloc[-1]) else None,
-        sma50=float(sma50.iloc[-1]) if not np.isnan(sma50.iloc[-1]) else None,
-        sma200=float(sma200.iloc[-1]) if not np.isnan(sma200.iloc[-1]) else None,
-        ema9=float(ema9.iloc[-1]) if not np.isnan(ema9.iloc[-1]) else None,
-        ema21=float(ema21.iloc[-1]) if not np.isnan(ema21.iloc[-1]) else None,
-        slope10=_slope_pct_per_day(sma10, 10),
-        slope20=_slope_pct_per_day(sma20, 20),
-        slope50=_slope_pct_per_day(sma50, 50),
-        slope200=_slope_pct_per_day(sma200, 200),
-        above10=bool(
-            price
-            > (float(sma10.iloc[-1]) if not np.isnan(sma10.iloc[-1]) else float("inf"))
-        ),
-        above20=bool(
-            price
-            > (float(sma20.iloc[-1]) if not np.isnan(sma20.iloc[-1]) else float("inf"))
-        ),
-        above50=bool(
-            price
-            > (float(sma50.iloc[-1]) if not np.isnan(sma50.iloc[-1]) else float("inf"))
-        ),
-        above200=bool(
-            price
-            > (
-                float(sma200.iloc[-1])
-                if not np.isnan(sma200.iloc[-1])
-                else float("inf")
-            )
-        ),
+        sma10=sma10,
+        sma20=sma20,
+        sma50=sma50,
+        sma200=sma200,
+        ema9=_ewm_last(closes, 2 / (9 + 1)),
+        ema21=_ewm_last(closes, 2 / (21 + 1)),
+        slope10=slope10,
+        slope20=slope20,
+        slope50=slope50,
+        slope200=slope200,
+        above10=_above(sma10),
+        above20=_above(sma20),
+        above50=_above(sma50),
+        above200=_above(sma200),
     )
     return dto
 
 
+@router.get("/trend", response_model=TrendDTO)
+async def trend(
+    request: Request,
+    symbol: str = Query(..., min_length=1),
+    provider=Depends(_provider),
+):
+    key = ("trend", symbol.upper())
+    return await _cached_metric(request, key, _trend, request, provider, symbol)
+
+
 @router.get("/trend/lite", response_model=List[TrendLiteDTO])
 async def trend_lite(
     request: Request,
@@ -599,22 +631,18 @@ async def trend_lite(
     return results
 
 
-@router.get("/momentum", response_model=MomentumDTO)
-async def momentum(
-    request: Request,
-    symbol: str = Query(..., min_length=1),
-    provider=Depends(_provider),
-):
+async def _momentum(request: Request, provider, symbol: str) -> MomentumDTO:
     ohlc = await _fetch_ohlc(request, provider, symbol, period="12mo", interval="1d")
     s = _close_series_from_ohlc(ohlc)
+    closes = s.to_numpy()
 
     def pct(n: int) -> Optional[float]:
-        if len(s) <= n:
+        if len(closes) <= n:
             return None
-        base = s.iloc[-1 - n]
-        if base == 0 or pd.isna(base):
+        base = closes[-1 - n]
+        if base == 0 or np.isnan(base):
             return None
-        return float(s.iloc[-1] / base - 1)
+        return float(closes[-1] / base - 1)
 
     return MomentumDTO(
         symbol=symbol.upper(),
@@ -625,25 +653,28 @@ async def momentum(
     )
 
 
-@router.get("/rsi", response_model=RsiDTO)
-async def rsi(
+@router.get("/momentum", response_model=MomentumDTO)
+async def momentum(
     request: Request,
     symbol: str = Query(..., min_length=1),
     provider=Depends(_provider),
 ):
+    key = ("momentum", symbol.upper())
+    return await _cached_metric(request, key, _momentum, request, provider, symbol)
+
+
+async def _rsi(request: Request, provider, symbol: str) -> RsiDTO:
     ohlc = await _fetch_ohlc(request, provider, symbol, period="6mo", interval="1d")
     s = _close_series_from_ohlc(ohlc)
     if s.empty:
         return RsiDTO(symbol=symbol.upper(), as_of=None, rsi=None, state=None)
-    delta = s.diff()
-    up = delta.clip(lower=0)
-    down = -delta.clip(upper=0)
-    roll_up = up.ewm(alpha=1 / 14, adjust=False).mean()
-    roll_down = down.ewm(alpha=1 / 14, adjust=False).mean()
-    rs = roll_up / roll_down.replace(0, np.nan)
-    last_rs = rs.iloc[-1]
-    if pd.isna(last_rs) or np.isinf(last_rs):
-        return RsiDTO(symbol=symbol.upper(), as_of=s.index[-1].date().isoformat(), rsi=None, state=None)
+    as_of = s.index[-1].date().isoformat()
+    delta = np.diff(s.to_numpy())
+    # Wilder's smoothing is an EMA with alpha = 1/14.
+    roll_down = _ewm_last(np.maximum(-delta, 0.0), 1 / 14) if len(delta) else 0.0
+    if roll_down == 0:
+        return RsiDTO(symbol=symbol.upper(), as_of=as_of, rsi=None, state=None)
+    last_rs = _ewm_last(np.maximum(delta, 0.0), 1 / 14) / roll_down
     rsi_val = float(100 - (100 / (1 + last_rs)))
     state = "Neutral"
     if rsi_val > 70:
@@ -652,39 +683,52 @@ async def rsi(
         state = "Oversold"
     return RsiDTO(
         symbol=symbol.upper(),
-        as_of=s.index[-1].date().isoformat(),
+        as_of=as_of,
         rsi=rsi_val,
         state=state,
     )
 
 
-@router.get("/vix", response_model=VixDTO)
-async def vix(provider=Depends(_provider)):
+@router.get("/rsi", response_model=RsiDTO)
+async def rsi(
+    request: Request,
+    symbol: str = Query(..., min_length=1),
+    provider=Depends(_provider),
+):
+    key = ("rsi", symbol.upper())
+    return await _cached_metric(request, key, _rsi, request, provider, symbol)
+
+
+async def _vix(provider) -> VixDTO:
     ohlc = await provider.get_ohlc("^VIX", period="3mo", interval="1d")
     s = _close_series_from_ohlc(ohlc)
     if s.empty:
         return VixDTO(as_of=None, value=None, avg7=None)
-    avg7 = float(s.rolling(7).mean().iloc[-1]) if len(s) >= 7 else None
+    closes = s.to_numpy()
+    avg7 = float(closes[-7:].mean()) if len(closes) >= 7 else None
     return VixDTO(
-        as_of=s.index[-1].date().isoformat(), value=float(s.iloc[-1]), avg7=avg7
+        as_of=s.index[-1].date().isoformat(), value=float(closes[-1]), avg7=avg7
     )
 
 
-@router.get("/returns", response_model=ReturnsDTO)
-async def returns(
-    request: Request,
-    symbol: str = Query(..., min_length=1),
-    windows: str = Query("MTD,YTD"),
-    provider=Depends(_provider),
-):
-    req_windows = [w.strip().upper() for w in windows.split(",") if w.strip()]
+@router.get("/vix", response_model=VixDTO)
+async def vix(request: Request, provider=Depends(_provider)):
+    return await _cached_metric(request, ("vix",), _vix, provider)
+
+
+async def _returns(
+    request: Request, provider, symbol: str, req_windows: Tuple[str, ...]
+) -> ReturnsDTO:
     ohlc = await _fetch_ohlc(request, provider, symbol, period="2y", interval="1d")
     s = _close_series_from_ohlc(ohlc)
     out: Dict[str, Optional[float]] = {"MTD": None, "YTD": None}
     if s.empty:
         return ReturnsDTO(**{k: out.get(k) for k in ["MTD", "YTD"]})
-    last_date = s.index[-1]
-    last_close = float(s.iloc[-1])
+    closes = s.to_numpy()
+    last_close = float(closes[-1])
+    # The index is sorted, so period boundaries are found by binary search
+    # on month/year-truncated dates instead of masking the whole series.
+    days = s.index.to_numpy().astype("datetime64[D]")
 
     def pct_vs(ref: Optional[float]) -> Optional[float]:
         if ref is None or ref == 0 or pd.isna(ref):
@@ -692,24 +736,39 @@ async def returns(
         return float(last_close / ref - 1)
 
     if "MTD" in req_windows:
-        prev_month_dt = last_date.replace(day=1) - pd.Timedelta(days=1)
-        ref = s[
-            (s.index.month == prev_month_dt.month)
-            & (s.index.year == prev_month_dt.year)
-        ]
-        mtd_ref = float(ref.iloc[-1]) if len(ref) else None
+        # MTD: last close vs last trading day of the prior calendar month
+        months = days.astype("datetime64[M]")
+        pos = int(np.searchsorted(months, months[-1]))
+        mtd_ref = (
+            float(closes[pos - 1])
+            if pos and months[pos - 1] == months[-1] - 1
+            else None
+        )
         out["MTD"] = pct_vs(mtd_ref)
 
         if "YTD" in req_windows:
-            # YTD: last close vs last trading day of prior calendar year
-            prev_year = int(last_date.year) - 1
-            ref = s[s.index.year == prev_year]
-            if len(ref):
-                ytd_ref: Optional[float] = float(ref.iloc[-1])
+            # YTD: last close vs last trading day of prior calendar year,
+            # else the first close of this year
+            years = days.astype("datetime64[Y]")
+            pos = int(np.searchsorted(years, years[-1]))
+            if pos and years[pos - 1] == years[-1] - 1:
+                ytd_ref: Optional[float] = float(closes[pos - 1])
             else:
-                cur_year = last_date.year
-                start = s[s.index.year == cur_year]
-                ytd_ref = float(start.iloc[0]) if len(start) else None
+                ytd_ref = float(closes[pos])
             out["YTD"] = pct_vs(ytd_ref)
 
     return ReturnsDTO(**{k: out.get(k) for k in ["MTD", "YTD"]})
+
+
+@router.get("/returns", response_model=ReturnsDTO)
+async def returns(
+    request: Request,
+    symbol: str = Query(..., min_length=1),
+    windows: str = Query("MTD,YTD"),
+    provider=Depends(_provider),
+):
+    req_windows = tuple(w.strip().upper() for w in windows.split(",") if w.strip())
+    key = ("returns", symbol.upper(), req_windows)
+    return await _cached_metric(
+        request, key, _returns, request, provider, symbol, req_windows
+    )
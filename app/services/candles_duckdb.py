@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import duckdb  # type: ignore[import]
 
@@ -56,64 +56,99 @@ def period_start(period: Optional[str]) -> Optional[date]:
     return date.today() - timedelta(days=days)
 
 
-def get_daily_eod(symbol: str, start: Optional[Any] = None, end: Optional[Any] = None) -> List[Dict[str, Any]]:
-    sym = symbol.strip().upper()
-    if not sym:
-        return []
-    if not sector_snapshot.SNAPSHOT_DB.exists():
-        return []
-
+def _eod_record(row: Tuple[Any, ...]) -> Dict[str, Any]:
+    dt_value, open_px, high_px, low_px, close_px, volume, dollar_volume = row
+    if isinstance(dt_value, datetime):
+        date_field = dt_value
+    elif isinstance(dt_value, date):
+        date_field = datetime.combine(dt_value, datetime.min.time())
+    else:
+        try:
+            date_field = datetime.fromisoformat(str(dt_value))
+        except ValueError:
+            date_field = datetime.min
+    return {
+        "date": date_field,
+        "open": open_px,
+        "high": high_px,
+        "low": low_px,
+        "close": close_px,
+        "volume": volume,
+        "dollar_volume": dollar_volume,
+    }
+
+
+def _date_filters(
+    start: Optional[Any], end: Optional[Any]
+) -> Tuple[List[str], List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
     start_date = _coerce_date(start)
     end_date = _coerce_date(end)
-
-    query = [
-        "SELECT date, open, high, low, close, volume, dollar_volume",
-        "FROM ticker_ohlc",
-        "WHERE symbol = ?",
-    ]
-    params: List[Any] = [sym]
     if start_date:
-        query.append("AND date >= ?")
+        clauses.append("AND date >= ?")
         params.append(start_date)
     if end_date:
-        query.append("AND date <= ?")
+        clauses.append("AND date <= ?")
         params.append(end_date)
-    query.append("ORDER BY date")
-    sql = " ".join(query)
+    return clauses, params
+
 
-    records: List[Dict[str, Any]] = []
+def _fetch_rows(sql: str, params: List[Any]) -> List[Tuple[Any, ...]]:
     conn = duckdb.connect(str(sector_snapshot.SNAPSHOT_DB))
     try:
-        rows = conn.execute(sql, params).fetchall()
+        return conn.execute(sql, params).fetchall()
     except duckdb.Error:
-        conn.close()
         return []
     finally:
         conn.close()
 
-    for dt_value, open_px, high_px, low_px, close_px, volume, dollar_volume in rows:
-        date_value = dt_value
-        if isinstance(date_value, datetime):
-            date_field = date_value
-        elif isinstance(date_value, date):
-            date_field = datetime.combine(date_value, datetime.min.time())
-        else:
-            try:
-                date_field = datetime.fromisoformat(str(date_value))
-            except ValueError:
-                date_field = datetime.min
-        records.append(
-            {
-                "Date": date_field,
-                "Open": open_px,
-                "High": high_px,
-                "Low": low_px,
-                "Close": close_px,
-                "Volume": volume,
-                "DollarVolume": dollar_volume,
-            }
-        )
-    return records
-
-
-__all__ = ["get_daily_eod", "period_start"]
+
+def get_daily_eod(
+    symbol: str, start: Optional[Any] = None, end: Optional[Any] = None
+) -> List[Dict[str, Any]]:
+    sym = symbol.strip().upper()
+    if not sym:
+        return []
+    if not sector_snapshot.SNAPSHOT_DB.exists():
+        return []
+
+    filters, filter_params = _date_filters(start, end)
+    query = [
+        "SELECT date, open, high, low, close, volume, dollar_volume",
+        "FROM ticker_ohlc",
+        "WHERE symbol = ?",
+        *filters,
+        "ORDER BY date",
+    ]
+    rows = _fetch_rows(" ".join(query), [sym, *filter_params])
+    return [_eod_record(row) for row in rows]
+
+
+def get_daily_eod_batch(
+    symbols: Iterable[str], start: Optional[Any] = None, end: Optional[Any] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Like ``get_daily_eod`` for many symbols, using one connection and query.
+
+    Every requested (normalised) symbol is present in the result; symbols with
+    no stored bars map to an empty list.
+    """
+    syms = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+    out: Dict[str, List[Dict[str, Any]]] = {sym: [] for sym in syms}
+    if not syms or not sector_snapshot.SNAPSHOT_DB.exists():
+        return out
+
+    filters, filter_params = _date_filters(start, end)
+    query = [
+        "SELECT symbol, date, open, high, low, close, volume, dollar_volume",
+        "FROM ticker_ohlc",
+        f"WHERE symbol IN ({', '.join('?' * len(syms))})",
+        *filters,
+        "ORDER BY symbol, date",
+    ]
+    for sym, *row in _fetch_rows(" ".join(query), [*syms, *filter_params]):
+        out[sym].append(_eod_record(tuple(row)))
+    return out
+
+
+__all__ = ["get_daily_eod", "get_daily_eod_batch", "period_start"]
@@ -69,7 +69,7 @@ class JobManager:
     async def start(self) -> None:
         if self._started:
             return
-        self._ensure_tables()
+        await asyncio.to_thread(self._ensure_tables)
         self._worker_task = asyncio.create_task(self._worker())
         self._started = True
 
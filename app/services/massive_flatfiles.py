@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import logging
+import math
 import os
+import threading
 from datetime import date, timedelta
 from pathlib import Path
-from typing import Iterable, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import boto3  # type: ignore[import]
 import duckdb  # type: ignore[import]
@@ -18,21 +20,35 @@ LOGGER = logging.getLogger("massive_flatfiles")
 FLATFILE_BUCKET = "flatfiles"
 DAY_AGG_PREFIX = "us_stocks_sip/day_aggs_v1"
 BASELINE_SYMBOLS = {"SPY", "QQQ", "IWM", "VIX"}
+_PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# boto3 clients are thread-safe; sharing one per credential pair keeps its
+# connection pool (and TLS sessions) warm across job backfills.
+_CLIENTS: Dict[Tuple[str, str], Any] = {}
+_CLIENTS_LOCK = threading.Lock()
 
 
 def create_massive_client():
+    """Return the process-wide S3 client for Massive flat files."""
     access_key = os.environ.get("MASSIVE_ACCESS_KEY_ID")
     secret_key = os.environ.get("MASSIVE_SECRET_ACCESS_KEY")
     if not access_key or not secret_key:
         raise RuntimeError(
             "Massive S3 credentials missing; set MASSIVE_ACCESS_KEY_ID and MASSIVE_SECRET_ACCESS_KEY"
         )
-    session = boto3.Session(aws_access_key_id=access_key, aws_secret_access_key=secret_key)
-    return session.client(
-        "s3",
-        endpoint_url="https://files.massive.com",
-        config=Config(signature_version="s3v4"),
-    )
+    key = (access_key, secret_key)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            session = boto3.Session(
+                aws_access_key_id=access_key, aws_secret_access_key=secret_key
+            )
+            client = _CLIENTS[key] = session.client(
+                "s3",
+                endpoint_url="https://files.massive.com",
+                config=Config(signature_version="s3v4"),
+            )
+    return client
 
 
 def massivet_key_for_date(target_date: date) -> str:
@@ -98,6 +114,21 @@ def tracked_symbols() -> Set[str]:
     return {sym for sym in symbols if sym}
 
 
+def _float_or_nan(value: object) -> float:
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _coerce_price_column(column: pd.Series) -> pd.Series:
+    # Text columns (a file with a stray bad cell) go through float() so parsed
+    # values match it exactly; numeric columns are cast in one step.
+    if column.dtype == object:
+        column = column.map(_float_or_nan)
+    return column.astype("float64")
+
+
 def rows_for_date(
     target_date: date,
     symbols: Set[str],
@@ -130,31 +161,29 @@ def rows_for_date(
 
     filtered["trading_date"] = pd.to_datetime(filtered["window_start"], unit="ns").dt.date
 
-    rows: List[Tuple[str, date, float, float, float, float, float, float]] = []
-    for row in filtered.itertuples(index=False):
-        try:
-            open_px = float(row.open)
-            high_px = float(row.high)
-            low_px = float(row.low)
-            close_px = float(row.close)
-            volume = float(row.volume)
-        except (TypeError, ValueError):
-            LOGGER.debug("Skipping invalid row for %s on %s", row.ticker, target_date)
-            continue
-        dollar_volume = close_px * volume
-        rows.append(
-            (
-                normalize_symbol(row.ticker),
-                row.trading_date,
-                open_px,
-                high_px,
-                low_px,
-                close_px,
-                volume,
-                dollar_volume,
-            )
+    raw_prices = filtered[_PRICE_COLUMNS]
+    prices = raw_prices.apply(_coerce_price_column)
+    # Blank cells stay NaN as before; only values that fail to parse are skipped.
+    invalid = (prices.isna() & raw_prices.notna()).any(axis=1)
+    if invalid.any():
+        for ticker in filtered.loc[invalid, "ticker"]:
+            LOGGER.debug("Skipping invalid row for %s on %s", ticker, target_date)
+        filtered = filtered[~invalid]
+        prices = prices[~invalid]
+
+    # Tickers were normalised column-wise above, so rows are zipped as-is.
+    return list(
+        zip(
+            filtered["ticker"].tolist(),
+            filtered["trading_date"].tolist(),
+            prices["open"].tolist(),
+            prices["high"].tolist(),
+            prices["low"].tolist(),
+            prices["close"].tolist(),
+            prices["volume"].tolist(),
+            (prices["close"] * prices["volume"]).tolist(),
         )
-    return rows
+    )
 
 
 def insert_rows(
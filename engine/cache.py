@@ -5,7 +5,27 @@ import asyncio
 import json
 import time
 from pathlib import Path
-from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+
+MISSING: Any = object()
+
+# Keys are plain strings or tuples such as ``(symbol, period, interval)``.
+CacheKey = Union[str, Tuple[Hashable, ...]]
+
+
+def _key_str(key: CacheKey) -> str:
+    return key if isinstance(key, str) else ":".join(map(str, key))
 
 
 class _InFlight:
@@ -18,16 +38,17 @@ class _InFlight:
 class AsyncTTLCache:
     """
     Async TTL cache with:
-      - per-key TTL
+      - per-key TTL (optionally shorter for empty results)
       - coalesced concurrent fetches
       - optional disk persistence (JSON per key)
     """
 
     def __init__(self, max_size: int = 4096, persist_dir: Optional[str] = None) -> None:
-        self._data: Dict[str, Tuple[float, Any]] = {}  # key -> (expires_at, value)
-        self._locks: Dict[str, asyncio.Lock] = {}
-        self._inflight: Dict[str, _InFlight] = {}
+        self._data: Dict[CacheKey, Tuple[float, Any]] = {}  # key -> (expires_at, value)
+        self._locks: Dict[CacheKey, asyncio.Lock] = {}
+        self._inflight: Dict[CacheKey, _InFlight] = {}
         self._max_size = max_size
+        self.evictions = 0
         self._persist_dir = Path(persist_dir) if persist_dir else None
         if self._persist_dir:
             self._persist_dir.mkdir(parents=True, exist_ok=True)
@@ -36,19 +57,19 @@ class AsyncTTLCache:
     def _now(self) -> float:
         return time.time()
 
-    async def _lock_for(self, key: str) -> asyncio.Lock:
+    async def _lock_for(self, key: CacheKey) -> asyncio.Lock:
         async with self._meta_lock:
             if key not in self._locks:
                 self._locks[key] = asyncio.Lock()
             return self._locks[key]
 
-    def _persist_path(self, key: str) -> Optional[Path]:
+    def _persist_path(self, key: CacheKey) -> Optional[Path]:
         if not self._persist_dir:
             return None
-        safe = key.replace("/", "_slash_").replace(":", "_colon_")
+        safe = _key_str(key).replace("/", "_slash_").replace(":", "_colon_")
         return self._persist_dir / f"{safe}.json"
 
-    def _try_load_from_disk(self, key: str) -> Optional[Any]:
+    def _try_load_from_disk(self, key: CacheKey) -> Optional[Any]:
         p = self._persist_path(key)
         if not p or not p.exists():
             return None
@@ -61,7 +82,7 @@ class AsyncTTLCache:
             pass
         return None
 
-    def _save_to_disk(self, key: str, value: Any, ttl: float) -> None:
+    def _save_to_disk(self, key: CacheKey, value: Any, ttl: float) -> None:
         p = self._persist_path(key)
         if not p:
             return
@@ -77,15 +98,18 @@ class AsyncTTLCache:
         if len(self._data) <= self._max_size:
             return
         items = sorted(self._data.items(), key=lambda kv: kv[1][0])
-        for i in range(len(self._data) - self._max_size):
+        excess = len(self._data) - self._max_size
+        for i in range(excess):
             self._data.pop(items[i][0], None)
+        self.evictions += excess
 
     async def get_or_set(
         self,
-        key: str,
+        key: CacheKey,
         ttl_seconds: float,
         fetcher: Callable[[], Awaitable[Any]],
         persist: bool = False,
+        miss_ttl_seconds: Optional[float] = None,
     ) -> Any:
         now = self._now()
         hit = self._data.get(key)
@@ -117,10 +141,14 @@ class AsyncTTLCache:
 
             try:
                 value = await fetcher()
-                self._data[key] = (now + ttl_seconds, value)
+                if miss_ttl_seconds is not None and not value:
+                    # Empty results are remembered briefly and never persisted.
+                    self._data[key] = (now + miss_ttl_seconds, value)
+                else:
+                    self._data[key] = (now + ttl_seconds, value)
+                    if persist:
+                        self._save_to_disk(key, value, ttl_seconds)
                 self._evict_if_needed()
-                if persist:
-                    self._save_to_disk(key, value, ttl_seconds)
                 setter = self._inflight.pop(key, None)
                 if setter:
                     setter.result = value
@@ -133,12 +161,15 @@ class AsyncTTLCache:
                     setter.event.set()
                 raise
 
+    def __len__(self) -> int:
+        return len(self._data)
+
     def purge(self, prefix: Optional[str] = None) -> None:
         if prefix is None:
             self._data.clear()
             return
         for k in list(self._data.keys()):
-            if k.startswith(prefix):
+            if _key_str(k).startswith(prefix):
                 del self._data[k]
 
 
@@ -150,14 +181,22 @@ class CacheManager:
         ohlc_ttl: int = 180,
         vix_ttl: int = 60,
         computed_ttl: int = 30,
+        ohlc_miss_ttl: int = 30,
+        ohlc_interval_ttl: Optional[Mapping[str, int]] = None,
         max_size: int = 4096,
         persist_dir: Optional[str] = None,
         persist_computed: bool = False,
     ) -> None:
-        self.quotes = AsyncTTLCache(max_size=max_size, persist_dir=persist_dir)
-        self.ohlc = AsyncTTLCache(max_size=max_size, persist_dir=persist_dir)
-        self.vix = AsyncTTLCache(max_size=max_size, persist_dir=persist_dir)
-        self.computed = AsyncTTLCache(max_size=max_size, persist_dir=persist_dir)
+        # Each namespace owns its cache (and persist subdirectory), so keys are
+        # stored as given rather than prefixed with the namespace.
+        def _ns_cache(namespace: str) -> AsyncTTLCache:
+            ns_dir = str(Path(persist_dir) / namespace) if persist_dir else None
+            return AsyncTTLCache(max_size=max_size, persist_dir=ns_dir)
+
+        self.quotes = _ns_cache("quotes")
+        self.ohlc = _ns_cache("ohlc")
+        self.vix = _ns_cache("vix")
+        self.computed = _ns_cache("computed")
 
         self.ttl = {
             "quotes": quotes_ttl,
@@ -165,6 +204,10 @@ class CacheManager:
             "vix": vix_ttl,
             "computed": computed_ttl,
         }
+        # Shorter TTLs for empty results (e.g. delisted or unknown symbols).
+        self.miss_ttl = {"ohlc": ohlc_miss_ttl}
+        # Per-interval overrides of the OHLC TTL (e.g. longer for weekly bars).
+        self.ohlc_interval_ttl: Dict[str, int] = dict(ohlc_interval_ttl or {})
         self._persist_flags = {
             "quotes": False,
             "ohlc": True,  # persist daily bars helps after restarts
@@ -172,34 +215,65 @@ class CacheManager:
             "computed": persist_computed,
         }
 
-        # simple per-namespace hit/miss counters
+        # simple per-namespace hit/miss/eviction counters
         self.stats = {
-            "quotes": {"hits": 0, "misses": 0},
-            "ohlc": {"hits": 0, "misses": 0},
-            "vix": {"hits": 0, "misses": 0},
-            "computed": {"hits": 0, "misses": 0},
+            "quotes": {"hits": 0, "misses": 0, "evictions": 0},
+            "ohlc": {"hits": 0, "misses": 0, "evictions": 0},
+            "vix": {"hits": 0, "misses": 0, "evictions": 0},
+            "computed": {"hits": 0, "misses": 0, "evictions": 0},
         }
 
+        if persist_dir:
+            self._migrate_flat_persist(Path(persist_dir))
+
+    def _migrate_flat_persist(self, root: Path) -> None:
+        """Move ``<ns>_colon_<key>.json`` files from the old flat layout into
+        ``<ns>/<key>.json`` so entries persisted before the split still load."""
+        for ns in self.ttl:
+            prefix = f"{ns}_colon_"
+            for old in root.glob(f"{prefix}*.json"):
+                new = root / ns / old.name[len(prefix) :]
+                try:
+                    if new.exists():
+                        old.unlink()
+                    else:
+                        old.replace(new)
+                except OSError:
+                    pass
+
     async def cached_fetch(
         self,
         namespace: str,
-        key: str,
+        key: CacheKey,
         fetcher: Callable[[], Awaitable[Any]],
+        ttl_seconds: Optional[float] = None,
     ) -> Any:
         cache = getattr(self, namespace)
-        ttl = self.ttl[namespace]
+        ttl = self.ttl[namespace] if ttl_seconds is None else ttl_seconds
         persist_flag = self._persist_flags.get(namespace, False)
-        namespaced_key = f"{namespace}:{key}"
 
         # check if key is already cached and unexpired to track hits/misses
         now = time.time()
-        hit = namespaced_key in cache._data and cache._data[namespaced_key][0] > now
+        hit = key in cache._data and cache._data[key][0] > now
         value = await cache.get_or_set(
-            namespaced_key, ttl_seconds=ttl, fetcher=fetcher, persist=persist_flag
+            key,
+            ttl_seconds=ttl,
+            fetcher=fetcher,
+            persist=persist_flag,
+            miss_ttl_seconds=self.miss_ttl.get(namespace),
         )
         ns_stats = self.stats[namespace]
         if hit:
             ns_stats["hits"] += 1
         else:
             ns_stats["misses"] += 1
+            ns_stats["evictions"] = cache.evictions
         return value
+
+    def peek(self, namespace: str, key: CacheKey) -> Any:
+        """Return an unexpired cached value (counted as a hit) or ``MISSING``."""
+        hit = getattr(self, namespace)._data.get(key)
+        if hit is not None and hit[0] > time.time():
+            self.stats[namespace]["hits"] += 1
+            return hit[1]
+        return MISSING
@@ -15,3 +15,6 @@ class MarketData(Protocol):
 
     async def get_vix_term(self) -> Optional[Dict[str, float]]:
         ...
+
+    async def aclose(self) -> None:
+        ...
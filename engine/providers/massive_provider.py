@@ -3,10 +3,18 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
-
+import functools
+import math
+import operator
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
 from massive import RESTClient
+from massive.exceptions import AuthError, BadResponse
 
 from engine.providers.base import MarketData
 
@@ -17,26 +25,70 @@ _VIX_SYMBOLS = {
     "^VIX3M": "C:VIX3M",
 }
 
+# Index tickers for the same legs, fetched together in one snapshot request.
+_VIX_INDEX_TICKERS = {
+    "^VIX9D": "I:VIX9D",
+    "^VIX": "I:VIX",
+    "^VIX3M": "I:VIX3M",
+}
+
+# Backoff between retries is awaited on the event loop, never inside a worker
+# thread, so a burst of failing calls does not tie up the default executor.
+# Delays use full jitter so concurrent callers do not retry in lockstep.
+_RETRY_BASE_DELAY = 0.25
+_RETRY_MAX_DELAY = 4.0
+
+# After this many consecutive calls exhaust their retries, calls fail fast
+# for the cooldown instead of queueing more attempts against a failing host.
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN = 60.0
+
+# The SDK already retries 429/5xx responses itself; these surface only for
+# statuses a retry cannot fix (bad key, unknown ticker, malformed request).
+_NON_RETRYABLE_ERRORS = (AuthError, BadResponse)
+
+# A snapshot missing a VIX leg is usually a data gap rather than a plan limit,
+# so skip it for a while instead of for good and use the per-leg closes.
+_VIX_SNAPSHOT_COOLDOWN = 300.0
+
+# Concurrent to_thread calls share one client. urllib3 keeps only ``maxsize``
+# idle connections per host (default 1) and closes the rest after use, so
+# size the pool to keep those connections, and their TLS sessions, alive.
+_POOL_MAXSIZE = 10
+
+
+class ProviderUnavailableError(RuntimeError):
+    """Raised without calling Massive while the circuit breaker is open."""
+
 
 def _now_utc() -> datetime:
     return datetime.now(tz=timezone.utc)
 
 
+_PERIOD_TO_DAYS = {
+    "5d": 7,
+    "1mo": 32,
+    "3mo": 92,
+    "6mo": 185,
+    "1y": 370,
+    "2y": 740,
+    "5y": 1850,
+    "10y": 3650,
+    "max": 5000,
+}
+
+_INTERVAL_TO_SPAN: Dict[str, Tuple[int, str]] = {
+    "1d": (1, "day"),
+    "1wk": (1, "week"),
+    "1mo": (1, "month"),
+}
+
+
 def _period_to_days(period: str) -> int:
-    mapping = {
-        "5d": 7,
-        "1mo": 32,
-        "3mo": 92,
-        "6mo": 185,
-        "1y": 370,
-        "2y": 740,
-        "5y": 1850,
-        "10y": 3650,
-        "max": 5000,
-    }
     key = (period or "6mo").lower()
-    if key in mapping:
-        return mapping[key]
+    days = _PERIOD_TO_DAYS.get(key)
+    if days is not None:
+        return days
     try:
         if key.endswith("d"):
             return max(1, int(key[:-1]))
@@ -49,25 +101,30 @@ def _period_to_days(period: str) -> int:
     return 365
 
 
+@functools.lru_cache(maxsize=64)
+def _date_window(today: date, period: str) -> Tuple[str, str]:
+    """Return the ``(from, to)`` ISO dates covering ``period`` up to ``today``.
+
+    Keyed on the UTC date, so entries never go stale within a day.
+    """
+    start = today - timedelta(days=_period_to_days(period))
+    return start.isoformat(), today.isoformat()
+
+
 def _interval_to_span(interval: str) -> Tuple[int, str]:
-    mapping = {
-        "1d": (1, "day"),
-        "1wk": (1, "week"),
-        "1mo": (1, "month"),
-    }
-    return mapping.get((interval or "1d").lower(), (1, "day"))
+    return _INTERVAL_TO_SPAN.get((interval or "1d").lower(), (1, "day"))
 
 
 def _safe_float(value: Any) -> Optional[float]:
+    if type(value) is float:
+        return value if math.isfinite(value) else None
+    if value is None:
+        return None
     try:
-        if value is None:
-            return None
         number = float(value)
     except (TypeError, ValueError):
         return None
-    if number != number or number in {float("inf"), float("-inf")}:
-        return None
-    return number
+    return number if math.isfinite(number) else None
 
 
 def _normalize_timestamp(value: Any) -> Optional[datetime]:
@@ -93,6 +150,80 @@ def _normalize_timestamp(value: Any) -> Optional[datetime]:
     return None
 
 
+# (long, short) attribute names for each aggregate field, in row order.
+_AGG_FIELDS = (
+    ("timestamp", "t"),
+    ("open", "o"),
+    ("high", "h"),
+    ("low", "l"),
+    ("close", "c"),
+    ("volume", "v"),
+)
+
+
+def _agg_rows(items: Sequence[Any]) -> Iterator[Tuple[Any, ...]]:
+    """Yield ``(timestamp, open, high, low, close, volume)`` per aggregate.
+
+    Attribute names are resolved from the first item and read with a single
+    ``attrgetter`` call per row; the SDK returns a uniform model per request.
+    """
+    if not items:
+        return
+    first = items[0]
+    names = []
+    for long_name, short_name in _AGG_FIELDS:
+        if hasattr(first, long_name):
+            names.append(long_name)
+        elif hasattr(first, short_name):
+            names.append(short_name)
+        else:
+            # Unknown shape: fall back to per-item probing.
+            for item in items:
+                yield tuple(_agg_to_dict(item).values())
+            return
+    getter = operator.attrgetter(*names)
+    for item in items:
+        try:
+            yield getter(item)
+        except AttributeError:
+            yield tuple(_agg_to_dict(item).values())
+
+
+def _float_column(values: Sequence[Any]) -> List[Optional[float]]:
+    """Coerce an OHLCV column at once; non-finite or bad values become None."""
+    try:
+        array = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return [_safe_float(value) for value in values]
+    column: List[Optional[float]] = array.tolist()
+    if not np.isfinite(array).all():
+        column = [value if math.isfinite(value) else None for value in column]
+    return column
+
+
+def _naive_utc_column(values: Sequence[Any]) -> List[Optional[datetime]]:
+    """Convert raw aggregate timestamps to naive UTC datetimes (None if invalid)."""
+    if set(map(type, values)) == {int}:
+        # Epoch integers (the SDK's normal shape): scale to microseconds by
+        # magnitude, as _normalize_timestamp does, and convert in one call.
+        try:
+            epoch = np.asarray(values, dtype=np.int64)
+        except OverflowError:
+            epoch = None
+        if epoch is not None:
+            micros = np.where(
+                epoch > 1_000_000_000_000_000,
+                epoch // 1_000,
+                np.where(epoch > 1_000_000_000_000, epoch * 1_000, epoch * 1_000_000),
+            )
+            return micros.astype("datetime64[us]").astype(object).tolist()
+    column: List[Optional[datetime]] = []
+    for value in values:
+        timestamp = _normalize_timestamp(value)
+        column.append(None if timestamp is None else timestamp.replace(tzinfo=None))
+    return column
+
+
 def _agg_to_dict(agg: Any) -> Dict[str, Any]:
     return {
         "timestamp": getattr(agg, "timestamp", getattr(agg, "t", None)),
@@ -104,6 +235,32 @@ def _agg_to_dict(agg: Any) -> Dict[str, Any]:
     }
 
 
+class AsyncTokenBucket:
+    """Token bucket whose ``acquire`` waits on the event loop, not in a thread."""
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.timestamp = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # The lock queues waiters so tokens are handed out in arrival order.
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.timestamp) * self.rate
+            )
+            self.timestamp = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self.tokens) / self.rate)
+            self.tokens = 0.0
+            self.timestamp = time.monotonic()
+
+
 class MassiveMarketData(MarketData):
     """Adapter exposing Massive RESTClient through the MarketData interface."""
 
@@ -114,30 +271,72 @@ class MassiveMarketData(MarketData):
         base_url: str = "https://api.massive.com",
         timeout: float = 10.0,
         retries: int = 3,
+        requests_per_minute: Optional[float] = None,
     ) -> None:
         # The Massive client automatically uses the default host; explicit
         # base URL overrides are not currently exposed, so we keep the value in
         # diagnostics only.
-        self._client = RESTClient(api_key=api_key)
+        self._client = RESTClient(
+            api_key=api_key,
+            connect_timeout=timeout,
+            read_timeout=timeout,
+            custom_json=orjson,
+        )
+        pool = getattr(self._client, "client", None)
+        if pool is not None:
+            pool.connection_pool_kw["maxsize"] = _POOL_MAXSIZE
         self._retries = max(0, int(retries))
         self._base_url = base_url
         self._success_count = 0
         self._failure_count = 0
+        self._consecutive_failures = 0
+        self._breaker_open_until = 0.0
+        # Cleared once the plan turns out not to include index snapshots.
+        self._vix_snapshot = True
+        self._vix_snapshot_retry_at = 0.0
+        # Optional client-side pacing for plans with a per-minute request quota.
+        self._bucket = (
+            AsyncTokenBucket(requests_per_minute / 60.0)
+            if requests_per_minute
+            else None
+        )
+
+    def _breaker_open(self) -> bool:
+        return time.monotonic() < self._breaker_open_until
+
+    def _record_exhausted(self) -> None:
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= _BREAKER_THRESHOLD:
+            self._breaker_open_until = time.monotonic() + _BREAKER_COOLDOWN
 
     async def _run(self, func, *args, **kwargs):
+        if self._breaker_open():
+            raise ProviderUnavailableError("Massive circuit breaker is open")
         attempt = 0
         last_exc: Optional[Exception] = None
         while attempt <= self._retries:
+            if self._bucket is not None:
+                await self._bucket.acquire()
             try:
                 result = await asyncio.to_thread(func, *args, **kwargs)
                 self._success_count += 1
+                self._consecutive_failures = 0
                 return result
             except Exception as exc:  # noqa: BLE001
                 last_exc = exc
                 self._failure_count += 1
                 attempt += 1
+                if isinstance(exc, _NON_RETRYABLE_ERRORS):
+                    raise
                 if attempt > self._retries:
+                    self._record_exhausted()
                     raise
+                await asyncio.sleep(
+                    random.uniform(
+                        0.0,
+                        min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** (attempt - 1)),
+                    )
+                )
         if last_exc:
             raise last_exc
         raise RuntimeError("Massive client call failed without raising an exception")
@@ -149,9 +348,7 @@ class MassiveMarketData(MarketData):
         period: str = "6mo",
         interval: str = "1d",
     ) -> List[Dict[str, Any]]:
-        days = _period_to_days(period)
-        start = (_now_utc() - timedelta(days=days)).strftime("%Y-%m-%d")
-        end = _now_utc().strftime("%Y-%m-%d")
+        start, end = _date_window(_now_utc().date(), period)
         multiplier, timespan = _interval_to_span(interval)
 
         def _fetch():
@@ -169,20 +366,22 @@ class MassiveMarketData(MarketData):
             )
 
         items = await self._run(_fetch)
+        rows = list(_agg_rows(items))
+        if not rows:
+            return []
+        # Coerce column-wise, then assemble the per-bar records in one pass.
+        raw_ts, *raw_values = zip(*rows)
+        opens, highs, lows, closes, volumes = map(_float_column, raw_values)
         bars: List[Dict[str, Any]] = []
-        for item in items:
-            payload = _agg_to_dict(item)
-            timestamp = _normalize_timestamp(payload["timestamp"])
-            if timestamp is None:
+        for bar_ts, open_px, high_px, low_px, close_px, volume in zip(
+            _naive_utc_column(raw_ts), opens, highs, lows, closes, volumes
+        ):
+            if bar_ts is None:
                 continue
-            open_px = _safe_float(payload["open"])
-            high_px = _safe_float(payload["high"])
-            low_px = _safe_float(payload["low"])
-            close_px = _safe_float(payload["close"])
-            volume = _safe_float(payload["volume"]) or 0.0
+            volume = volume or 0.0
             bars.append(
                 {
-                    "date": timestamp.replace(tzinfo=None),
+                    "date": bar_ts,
                     "open": open_px,
                     "high": high_px,
                     "low": low_px,
@@ -214,10 +413,44 @@ class MassiveMarketData(MarketData):
                 price = getattr(results[0], "close", getattr(results[0], "c", None))
         return _safe_float(price)
 
-    async def get_vix_term(self) -> Optional[Dict[str, float]]:
+    async def _get_vix_snapshot(self) -> Optional[Dict[str, float]]:
+        def _fetch():
+            return self._client.get_snapshot_indices(
+                ticker_any_of=list(_VIX_INDEX_TICKERS.values())
+            )
+
+        snapshots = await self._run(_fetch)
+        by_ticker = {getattr(snap, "ticker", None): snap for snap in snapshots or []}
         values: Dict[str, float] = {}
-        for app_symbol, massive_symbol in _VIX_SYMBOLS.items():
-            price = await self._get_previous_close(massive_symbol)
+        for app_symbol, ticker in _VIX_INDEX_TICKERS.items():
+            session = getattr(by_ticker.get(ticker), "session", None)
+            price = _safe_float(getattr(session, "previous_close", None))
+            if price is None:
+                return None
+            values[app_symbol] = price
+        return values
+
+    async def get_vix_term(self) -> Optional[Dict[str, float]]:
+        # One indices snapshot covers all three legs; fall back to per-leg
+        # previous closes when the plan lacks index data or a leg is missing.
+        if self._vix_snapshot and time.monotonic() >= self._vix_snapshot_retry_at:
+            try:
+                values = await self._get_vix_snapshot()
+            except _NON_RETRYABLE_ERRORS:
+                self._vix_snapshot = False
+                values = None
+            else:
+                if values is not None:
+                    return values
+                self._vix_snapshot_retry_at = time.monotonic() + _VIX_SNAPSHOT_COOLDOWN
+
+        # The SDK has no multi-ticker previous-close call, so fetch the three
+        # legs concurrently rather than paying three sequential round trips.
+        prices = await asyncio.gather(
+            *(self._get_previous_close(sym) for sym in _VIX_SYMBOLS.values())
+        )
+        values = {}
+        for app_symbol, price in zip(_VIX_SYMBOLS, prices):
             if price is None:
                 return None
             values[app_symbol] = price
@@ -241,7 +474,8 @@ class MassiveMarketData(MarketData):
                 "failure": self._failure_count,
                 "rate": rate,
             },
+            "circuit_open": self._breaker_open(),
         }
 
 
-__all__ = ["MassiveMarketData"]
+__all__ = ["AsyncTokenBucket", "MassiveMarketData", "ProviderUnavailableError"]
@@ -520,12 +520,12 @@ def upsert_ohlc_rows(
     conn: duckdb.DuckDBPyConnection, symbol: str, rows: Iterable[Dict[str, object]]
 ) -> None:
     for row in rows:
-        date_value = row.get("Date") or row.get("date")
-        open_px = row.get("Open") or row.get("open")
-        high_px = row.get("High") or row.get("high")
-        low_px = row.get("Low") or row.get("low")
-        close = row.get("Close") or row.get("close")
-        volume = row.get("Volume") or row.get("volume")
+        date_value = row.get("date")
+        open_px = row.get("open")
+        high_px = row.get("high")
+        low_px = row.get("low")
+        close = row.get("close")
+        volume = row.get("volume")
         if close is None or volume is None:
             continue
         if hasattr(date_value, "date"):
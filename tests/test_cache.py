@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import time
+from functools import partial
+from typing import Any, List
+
+import pytest
+
+from engine.cache import CacheManager
+
+
+@pytest.mark.anyio("asyncio")
+async def test_cached_fetch_hits_and_misses():
+    cache = CacheManager()
+    calls: List[Any] = []
+
+    async def fetch(symbol: str, *, period: str) -> List[str]:
+        calls.append((symbol, period))
+        return [symbol, period]
+
+    fetcher = partial(fetch, "SPY", period="1y")
+    first = await cache.cached_fetch("ohlc", "SPY:1y", fetcher)
+    second = await cache.cached_fetch("ohlc", "SPY:1y", fetcher)
+
+    assert first == second == ["SPY", "1y"]
+    assert calls == [("SPY", "1y")]
+    assert cache.stats["ohlc"] == {"hits": 1, "misses": 1, "evictions": 0}
+    assert len(cache.ohlc) == 1
+
+
+@pytest.mark.anyio("asyncio")
+async def test_empty_results_use_miss_ttl(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr("engine.cache.time.time", lambda: now[0])
+    cache = CacheManager(ohlc_ttl=180, ohlc_miss_ttl=30)
+    calls: List[str] = []
+
+    async def fetch(symbol: str) -> List[Any]:
+        calls.append(symbol)
+        return []
+
+    await cache.cached_fetch("ohlc", "ZZZZ", partial(fetch, "ZZZZ"))
+    await cache.cached_fetch("ohlc", "ZZZZ", partial(fetch, "ZZZZ"))
+    assert calls == ["ZZZZ"]
+
+    now[0] += 31
+    await cache.cached_fetch("ohlc", "ZZZZ", partial(fetch, "ZZZZ"))
+    assert calls == ["ZZZZ", "ZZZZ"]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_evictions_are_counted():
+    cache = CacheManager(max_size=2)
+
+    async def fetch(symbol: str) -> str:
+        return symbol
+
+    for symbol in ("A", "B", "C", "D"):
+        await cache.cached_fetch("quotes", symbol, partial(fetch, symbol))
+
+    assert len(cache.quotes) == 2
+    assert cache.stats["quotes"]["evictions"] == 2
+
+
+@pytest.mark.anyio("asyncio")
+async def test_tuple_keys_persist_per_namespace(tmp_path):
+    cache = CacheManager(persist_dir=str(tmp_path))
+
+    async def fetch() -> List[str]:
+        return ["bar"]
+
+    await cache.cached_fetch("ohlc", ("SPY", "1y", "1d"), fetch)
+
+    assert cache.peek("ohlc", ("SPY", "1y", "1d")) == ["bar"]
+    assert [p.name for p in (tmp_path / "ohlc").iterdir()] == [
+        "SPY_colon_1y_colon_1d.json"
+    ]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_flat_persisted_entries_migrate_to_namespace_dirs(tmp_path):
+    payload = json.dumps({"expires_at": time.time() + 60, "value": ["old"]})
+    (tmp_path / "ohlc_colon_SPY_colon_1y_colon_1d.json").write_text(payload)
+    cache = CacheManager(persist_dir=str(tmp_path))
+
+    async def fetch() -> List[str]:
+        raise AssertionError("migrated entry should be served from disk")
+
+    assert await cache.cached_fetch("ohlc", ("SPY", "1y", "1d"), fetch) == ["old"]
+    assert not list(tmp_path.glob("*.json"))
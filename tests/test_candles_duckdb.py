@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import duckdb
+import pytest
+
+from app.services import candles_duckdb, sector_snapshot
+
+
+@pytest.fixture()
+def eod_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "market.duckdb"
+    monkeypatch.setattr(sector_snapshot, "SNAPSHOT_DB", db_path)
+    conn = duckdb.connect(str(db_path))
+    conn.execute(
+        "CREATE TABLE ticker_ohlc (symbol TEXT, date DATE, open DOUBLE, high DOUBLE,"
+        " low DOUBLE, close DOUBLE, volume DOUBLE, dollar_volume DOUBLE)"
+    )
+    conn.executemany(
+        "INSERT INTO ticker_ohlc VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("MSFT", dt.date(2024, 1, 3), 1, 2, 1, 2, 10, 20),
+            ("AAPL", dt.date(2024, 1, 3), 1, 2, 1, 1.5, 10, 15),
+            ("AAPL", dt.date(2024, 1, 2), 1, 2, 1, 1.0, 10, 10),
+            ("AAPL", dt.date(2023, 12, 1), 1, 2, 1, 0.5, 10, 5),
+        ],
+    )
+    conn.close()
+    return db_path
+
+
+def test_batch_matches_per_symbol_queries(eod_db):
+    start = dt.date(2024, 1, 1)
+    batch = candles_duckdb.get_daily_eod_batch([" aapl", "MSFT", "NOPE"], start)
+
+    assert list(batch) == ["AAPL", "MSFT", "NOPE"]
+    for sym in ("AAPL", "MSFT", "NOPE"):
+        assert batch[sym] == candles_duckdb.get_daily_eod(sym, start)
+    assert [row["close"] for row in batch["AAPL"]] == [1.0, 1.5]
+    assert batch["AAPL"][0]["date"] == dt.datetime(2024, 1, 2)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
+import json
 from typing import Any, Dict, List, Optional
 
 import httpx
@@ -18,12 +20,12 @@ def _gen_ohlc(days: int, base: float = 100.0) -> List[Dict[str, Any]]:
         close = base + i * 0.5
         out.append(
             {
-                "Date": dt.datetime(d.year, d.month, d.day),
-                "Open": close - 0.25,
-                "High": close + 0.5,
-                "Low": close - 0.5,
-                "Close": close,
-                "Volume": 1_000_000 + i * 1000,
+                "date": dt.datetime(d.year, d.month, d.day),
+                "open": close - 0.25,
+                "high": close + 0.5,
+                "low": close - 0.5,
+                "close": close,
+                "volume": 1_000_000 + i * 1000,
             }
         )
     return out
@@ -96,6 +98,111 @@ async def test_stock_series(aclient: httpx.AsyncClient):
     assert {"time", "open", "high", "low", "close", "volume"}.issubset(set(sample.keys()))
 
 
+class _RaggedProvider(_FakeProvider):
+    async def get_ohlc(
+        self, symbol: str, *, period: str = "6mo", interval: str = "1d"
+    ) -> List[Dict[str, Any]]:
+        return [
+            {"date": "2024-01-02", "open": "1.5", "high": 2, "low": 1, "close": 1.75},
+            {
+                "date": dt.date(2024, 1, 3),
+                "open": None,
+                "high": 2,
+                "low": 1,
+                "close": 1,
+            },
+            {"date": dt.date(2024, 1, 4), "open": 1, "high": 2, "low": 1, "close": "x"},
+            {
+                "date": dt.date(2024, 1, 5),
+                "open": 1,
+                "high": 2,
+                "low": 0.5,
+                "close": 1.5,
+                "volume": 10,
+            },
+        ]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_stock_series_drops_incomplete_rows(app_instance):
+    from app.main import get_stock_data
+
+    original = app_instance.state.market
+    app_instance.state.market = _RaggedProvider()
+    try:
+        response = await get_stock_data("SPY")
+    finally:
+        app_instance.state.market = original
+    rows = json.loads(response.body)
+    assert [row["time"] for row in rows] == ["2024-01-02", "2024-01-05"]
+    assert rows[0]["open"] == 1.5
+    assert rows[0]["volume"] == 0.0
+    assert rows[1]["volume"] == 10.0
+
+
+@pytest.mark.anyio("asyncio")
+async def test_stock_series_honours_if_none_match(app_instance):
+    from app.main import get_stock_data
+
+    first = await get_stock_data("SPY")
+    etag = first.headers["etag"]
+
+    again = await get_stock_data("SPY", if_none_match=etag)
+    assert again.status_code == 304
+    assert again.body == b""
+
+    changed = await get_stock_data("SPY", period="1y", if_none_match=etag)
+    assert changed.status_code == 200
+
+
+@pytest.mark.anyio("asyncio")
+async def test_cached_provider_survives_cancelled_caller():
+    from app.main import CachedProvider
+    from engine.cache import CacheManager
+
+    class _SlowProvider(_FakeProvider):
+        calls = 0
+
+        async def get_ohlc(
+            self, symbol: str, *, period: str = "6mo", interval: str = "1d"
+        ):
+            type(self).calls += 1
+            await asyncio.sleep(0.05)
+            return _gen_ohlc(5)
+
+    provider = CachedProvider(_SlowProvider(), CacheManager())
+    first = asyncio.ensure_future(provider.get_ohlc("SPY"))
+    await asyncio.sleep(0)  # the first caller starts the upstream fetch
+    others = [asyncio.ensure_future(provider.get_ohlc("SPY")) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    # e.g. a wait_for timeout on the request that triggered the fetch
+    first.cancel()
+    results = await asyncio.gather(*others)
+
+    assert first.cancelled()
+    assert _SlowProvider.calls == 1
+    assert all(rows == results[0] and rows for rows in results)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_cached_provider_applies_interval_ttl(monkeypatch):
+    from app.main import CachedProvider
+    from engine.cache import CacheManager
+
+    now = [1_000.0]
+    monkeypatch.setattr("engine.cache.time.time", lambda: now[0])
+    cache = CacheManager(ohlc_ttl=180, ohlc_interval_ttl={"1wk": 900})
+    provider = CachedProvider(_FakeProvider(), cache)
+
+    await provider.get_ohlc("SPY", interval="1d")
+    await provider.get_ohlc("SPY", interval="1wk")
+    now[0] += 181
+    await provider.get_ohlc("SPY", interval="1d")
+    await provider.get_ohlc("SPY", interval="1wk")
+
+    assert cache.stats["ohlc"] == {"hits": 1, "misses": 3, "evictions": 0}
+
+
 @pytest.mark.anyio("asyncio")
 async def test_compass(aclient: httpx.AsyncClient):
     r = await aclient.get("/compass")
@@ -117,6 +224,35 @@ async def test_metrics_trend(aclient: httpx.AsyncClient):
     assert data["sma50"] is not None
 
 
+@pytest.mark.anyio("asyncio")
+async def test_metrics_served_from_computed_cache(app_instance, aclient, monkeypatch):
+    from app.middleware import rate_limiter
+    from engine.cache import CacheManager
+
+    calls: List[str] = []
+
+    class _CountingProvider(_FakeProvider):
+        async def get_ohlc(
+            self, symbol: str, *, period: str = "6mo", interval: str = "1d"
+        ):
+            calls.append(symbol)
+            return await super().get_ohlc(symbol, period=period, interval=interval)
+
+    cache = CacheManager()
+    monkeypatch.setattr(rate_limiter, "is_allowed", lambda client_ip: True)
+    monkeypatch.setattr(app_instance.state, "market", _CountingProvider())
+    monkeypatch.setattr(app_instance.state, "cache", cache)
+
+    first = await aclient.get("/metrics/trend", params={"symbol": "SPY"})
+    again = await aclient.get("/metrics/trend", params={"symbol": "spy"})
+    other = await aclient.get("/metrics/rsi", params={"symbol": "SPY"})
+
+    assert first.json() == again.json()
+    assert other.json()["symbol"] == "SPY"
+    assert calls == ["SPY", "SPY"]  # trend once, rsi once
+    assert cache.stats["computed"]["hits"] == 1
+
+
 @pytest.mark.anyio("asyncio")
 async def test_metrics_momentum(aclient: httpx.AsyncClient):
     r = await aclient.get("/metrics/momentum", params={"symbol": "QQQ"})
@@ -165,6 +301,45 @@ async def test_returns(aclient: httpx.AsyncClient):
     assert "MTD" in data and "YTD" in data
 
 
+def test_extract_ohlc_masks_unusable_rows():
+    import numpy as np
+
+    from app.routes.api import _extract_ohlc
+
+    series = _extract_ohlc(
+        [
+            {"close": 1.0, "volume": 10},
+            {"close": None, "volume": 20},
+            {"close": "2.5", "volume": 30},
+            {"close": "bad", "volume": 40},
+            {"close": 3.0, "volume": float("inf")},
+            {"close": 4.0},
+        ]
+    )
+
+    assert isinstance(series["close"], np.ndarray)
+    assert series["close"].tolist() == [1.0, 2.5]
+    assert series["vol"].tolist() == [10.0, 30.0]
+
+
+def test_close_series_skips_missing_closes_and_sorts():
+    import pandas as pd
+
+    from app.routes.metrics import _close_series_from_ohlc
+
+    series = _close_series_from_ohlc(
+        [
+            {"date": pd.Timestamp("2024-01-03", tz="UTC"), "close": "3.5"},
+            {"date": pd.Timestamp("2024-01-02", tz="UTC"), "close": None},
+            {"date": pd.Timestamp("2024-01-01", tz="UTC"), "close": 1.0},
+        ]
+    )
+
+    assert series.tolist() == [1.0, 3.5]
+    assert series.index.tz is None
+    assert series.index[-1].date() == dt.date(2024, 1, 3)
+
+
 @pytest.mark.anyio("asyncio")
 async def test_screen(aclient: httpx.AsyncClient):
     r = await aclient.get("/screen", params={"symbols": "AAPL,MSFT"})
@@ -175,6 +350,53 @@ async def test_screen(aclient: httpx.AsyncClient):
 
 
 @pytest.mark.anyio("asyncio")
+async def test_screen_reports_failures_per_symbol(app_instance, monkeypatch):
+    from types import SimpleNamespace
+
+    from app.routes import api
+
+    class _HangingProvider(_FakeProvider):
+        async def get_ohlc(
+            self, symbol: str, *, period: str = "6mo", interval: str = "1d"
+        ):
+            if symbol == "HANG":
+                await asyncio.sleep(10)
+            if symbol == "FAIL":
+                raise RuntimeError("upstream error")
+            return await super().get_ohlc(symbol, period=period, interval=interval)
+
+    monkeypatch.setattr(api, "_PROVIDER_TIMEOUT", 0.01)
+    monkeypatch.setattr(app_instance.state, "market", _HangingProvider())
+    payload = await api.screen(SimpleNamespace(app=app_instance), "AAPL,HANG,FAIL")
+
+    by_symbol = {row["symbol"]: row for row in payload["results"]}
+    assert by_symbol["HANG"] == {"symbol": "HANG", "error": "timeout"}
+    assert by_symbol["FAIL"] == {"symbol": "FAIL", "error": "fetch failed"}
+    assert "score" in by_symbol["AAPL"]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_screen_fetches_repeated_symbols_once(app_instance, monkeypatch):
+    from types import SimpleNamespace
+
+    from app.routes import api
+
+    calls: List[str] = []
+
+    class _CountingProvider(_FakeProvider):
+        async def get_ohlc(
+            self, symbol: str, *, period: str = "6mo", interval: str = "1d"
+        ):
+            calls.append(symbol)
+            return await super().get_ohlc(symbol, period=period, interval=interval)
+
+    monkeypatch.setattr(app_instance.state, "market", _CountingProvider())
+    payload = await api.screen(SimpleNamespace(app=app_instance), "AAPL, aapl,MSFT")
+
+    assert sorted(calls) == ["AAPL", "MSFT"]
+    assert [row["symbol"] for row in payload["results"]].count("AAPL") == 2
+
+
 @pytest.mark.anyio("asyncio")
 async def test_debug_market_data(aclient: httpx.AsyncClient):
     r = await aclient.get("/debug/market-data")
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.routes import api
+
+_SIGNALS = [
+    "up4", "dn4", "up10", "dn10", "up25", "dn25",
+    "up25m", "dn25m", "up50m", "dn50m", "up25q", "dn25q",
+]
+
+
+@pytest.fixture()
+def stocks_parquet(tmp_path: Path, monkeypatch) -> Path:
+    rows = []
+    for day in pd.date_range("2024-01-02", periods=3, freq="D"):
+        for symbol, close in (("AAA", 10.0), ("BBB", 20.0)):
+            row = {
+                "date": day,
+                "symbol": symbol,
+                "close": close,
+                "daily_return_pct": 5.0 if symbol == "AAA" else -1.0,
+                "volume": 100.0,
+                "dollar_volume": close * 100.0,
+                "ret_20": 0.1,
+                "ret_from_min34": 0.2,
+                "ret_from_max34": -0.1,
+                "notes": "unused",
+            }
+            row.update({name: 0 for name in _SIGNALS})
+            row["up4"] = 1 if symbol == "AAA" else 0
+            rows.append(row)
+    out = tmp_path / "engine" / "out"
+    out.mkdir(parents=True)
+    path = out / "individual_stocks.parquet"
+    pd.DataFrame(rows).to_parquet(path, engine="pyarrow")
+    monkeypatch.chdir(tmp_path)
+    api._individual_stocks_daily_body.cache_clear()
+    monkeypatch.setattr(
+        api,
+        "_INDIVIDUAL_STOCKS_CACHE",
+        {
+            "table": None,
+            "date_rows": None,
+            "symbol_rows": None,
+            "signal_flags": None,
+            "ts": 0.0,
+            "etag": None,
+        },
+    )
+    return path
+
+
+@pytest.mark.anyio("asyncio")
+async def test_individual_stocks_daily_filters_date_and_signal(stocks_parquet):
+    response = await api.individual_stocks_daily(
+        date="2024-01-03", signal="up4", limit=10
+    )
+    rows = json.loads(response.body)
+    assert [row["symbol"] for row in rows] == ["AAA"]
+    assert response.headers["etag"]
+    # A cold daily query reads just that day; it does not load the whole file.
+    assert api._INDIVIDUAL_STOCKS_CACHE["table"] is None
+
+    await api.individual_stocks_symbol(symbol="AAA", days=1)
+    warm = await api.individual_stocks_daily(date="2024-01-03", signal="up4", limit=10)
+    assert warm.body == response.body
+
+
+@pytest.mark.anyio("asyncio")
+async def test_individual_stocks_symbol_formats_dates(stocks_parquet):
+    response = await api.individual_stocks_symbol(symbol="bbb", days=2)
+    rows = json.loads(response.body)
+    assert [row["date"] for row in rows] == [
+        "2024-01-03T00:00:00",
+        "2024-01-04T00:00:00",
+    ]
+    assert rows[0]["close"] == 20.0
+    table = api._INDIVIDUAL_STOCKS_CACHE["table"]
+    assert "notes" not in table.column_names
+    assert str(table.schema.field("up4").type) == "int8"
+    assert str(table.schema.field("symbol").type).startswith("dictionary")
+
+
+@pytest.mark.anyio("asyncio")
+async def test_concurrent_cold_requests_read_parquet_once(stocks_parquet, monkeypatch):
+    import asyncio
+
+    reads = []
+    read_table = api.pq.read_table
+
+    def _counting_read(*args, **kwargs):
+        reads.append(args)
+        return read_table(*args, **kwargs)
+
+    monkeypatch.setattr(api.pq, "read_table", _counting_read)
+    responses = await asyncio.gather(
+        *(
+            api.individual_stocks_symbol(symbol="AAA", days=5)
+            for _ in range(8)
+        )
+    )
+
+    assert len(reads) == 1
+    assert len({response.body for response in responses}) == 1
+
+
+@pytest.mark.anyio("asyncio")
+async def test_individual_stocks_honour_if_none_match(stocks_parquet, monkeypatch):
+    first = await api.individual_stocks_daily(date="2024-01-03", signal="up4", limit=10)
+    etag = first.headers["etag"]
+
+    def _no_load(*args, **kwargs):
+        raise AssertionError("data should not be read for a matching ETag")
+
+    monkeypatch.setattr(api, "_individual_stocks_day", _no_load)
+    monkeypatch.setattr(api, "_load_individual_stocks_table", _no_load)
+    daily = await api.individual_stocks_daily(
+        date="2024-01-03", signal="up4", limit=10, if_none_match=etag
+    )
+    symbol = await api.individual_stocks_symbol(
+        symbol="AAA", days=1, if_none_match=etag
+    )
+    assert (daily.status_code, symbol.status_code) == (304, 304)
+    assert daily.body == b""
+
+    # Repeats without the header are served from the serialised-body cache.
+    again = await api.individual_stocks_daily(date="2024-01-03", signal="up4", limit=10)
+    assert again.body == first.body
+
+
+@pytest.mark.anyio("asyncio")
+async def test_individual_stocks_negotiate_arrow_stream(stocks_parquet):
+    import pyarrow as pa
+
+    as_json = await api.individual_stocks_symbol(symbol="AAA", days=2)
+    as_arrow = await api.individual_stocks_symbol(
+        symbol="AAA", days=2, accept=api._ARROW_STREAM
+    )
+
+    assert as_arrow.media_type == api._ARROW_STREAM
+    assert as_arrow.headers["etag"] != as_json.headers["etag"]
+    table = pa.ipc.open_stream(as_arrow.body).read_all()
+    assert table.column("close").to_pylist() == [
+        row["close"] for row in json.loads(as_json.body)
+    ]
+
+    daily = await api.individual_stocks_daily(
+        date="2024-01-03", signal="up4", limit=10, accept=api._ARROW_STREAM
+    )
+    table = pa.ipc.open_stream(daily.body).read_all()
+    assert table.column("symbol").to_pylist() == ["AAA"]
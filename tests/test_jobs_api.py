@@ -221,9 +221,9 @@ async def test_add_ticker_endpoint_updates_snapshot(jobs_app, monkeypatch):
 
     records = [
         {
-            "Date": datetime(2024, 1, 1) + timedelta(days=i),
-            "Close": 50.0 + i,
-            "Volume": 1_000_000 + i * 10_000,
+            "date": datetime(2024, 1, 1) + timedelta(days=i),
+            "close": 50.0 + i,
+            "volume": 1_000_000 + i * 10_000,
         }
         for i in range(12)
     ]
@@ -286,9 +286,9 @@ async def test_remove_ticker_endpoint_updates_snapshot(jobs_app, monkeypatch):
 
     records = [
         {
-            "Date": datetime(2024, 1, 1) + timedelta(days=i),
-            "Close": 60.0 + i,
-            "Volume": 900_000 + i * 5000,
+            "date": datetime(2024, 1, 1) + timedelta(days=i),
+            "close": 60.0 + i,
+            "volume": 900_000 + i * 5000,
         }
         for i in range(12)
     ]
@@ -367,8 +367,8 @@ async def test_fetch_symbol_history_singleflight(monkeypatch):
             call_count["value"] += 1
             await asyncio.sleep(0.05)
             return [
-                {"Date": datetime(2024, 1, 1), "Close": 10.0, "Volume": 1_000_000.0},
-                {"Date": datetime(2024, 1, 2), "Close": 11.0, "Volume": 1_010_000.0},
+                {"date": datetime(2024, 1, 1), "close": 10.0, "volume": 1_000_000.0},
+                {"date": datetime(2024, 1, 2), "close": 11.0, "volume": 1_010_000.0},
             ]
 
     provider = FakeProvider()
@@ -90,6 +90,22 @@ async def test_list_trades_filters(aclient: httpx.AsyncClient):
     assert any(t["ticker"] == "AAPL" for t in trades)
 
 
+@pytest.mark.anyio("asyncio")
+async def test_list_trades_rejects_invalid_query(
+    aclient: httpx.AsyncClient, monkeypatch
+):
+    from app.middleware import rate_limiter
+
+    monkeypatch.setattr(rate_limiter, "is_allowed", lambda client_ip: True)
+    r = await aclient.get("/journal/trades", params={"limit": 0})
+    assert r.status_code == 422
+
+    r = await aclient.get(
+        "/journal/trades", params={"limit": 2, "start_date": "2024-01-01"}
+    )
+    assert r.status_code == 200
+
+
 @pytest.mark.anyio("asyncio")
 async def test_update_and_metrics(aclient: httpx.AsyncClient):
     entry_time = _make_entry_time()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import math
+from datetime import date
+
+import pandas as pd
+
+from app.services import massive_flatfiles
+
+
+def test_rows_for_date_skips_unparseable_rows(tmp_path, monkeypatch):
+    day_ns = 1_704_153_600_000_000_000  # 2024-01-02
+    path = tmp_path / "2024-01-02.csv.gz"
+    columns = ["ticker", "open", "high", "low", "close", "volume", "window_start"]
+    pd.DataFrame(
+        [
+            (" spy ", "1.5", 2, 1, 2, 10, day_ns),
+            ("QQQ", "bad", 2, 1, 2, 10, day_ns),
+            ("IWM", 1, 2, 1, None, 5, day_ns),
+            ("XYZ", 1, 2, 1, 2, 5, day_ns),
+        ],
+        columns=columns,
+    ).to_csv(path, index=False, compression="gzip")
+    monkeypatch.setattr(massive_flatfiles, "download_day_file", lambda *a, **k: path)
+
+    rows = massive_flatfiles.rows_for_date(
+        date(2024, 1, 2), {"SPY", "QQQ", "IWM"}, tmp_path
+    )
+
+    assert [row[0] for row in rows] == ["SPY", "IWM"]
+    assert rows[0] == ("SPY", date(2024, 1, 2), 1.5, 2.0, 1.0, 2.0, 10.0, 20.0)
+    # Blank cells are kept as NaN, as before; only unparseable text is dropped.
+    assert math.isnan(rows[1][5])
+
+
+def test_create_massive_client_is_shared(monkeypatch):
+    monkeypatch.setattr(massive_flatfiles, "_CLIENTS", {})
+    monkeypatch.setenv("MASSIVE_ACCESS_KEY_ID", "id")
+    monkeypatch.setenv("MASSIVE_SECRET_ACCESS_KEY", "secret")
+
+    first = massive_flatfiles.create_massive_client()
+    assert massive_flatfiles.create_massive_client() is first
+
+    monkeypatch.setenv("MASSIVE_SECRET_ACCESS_KEY", "rotated")
+    assert massive_flatfiles.create_massive_client() is not first
@@ -36,6 +36,18 @@ class _FakeRESTClient:
             results=[SimpleNamespace(close=42.0 if ticker.endswith("9D") else 44.0 if ticker.endswith("VIX") else 46.0)]
         )
 
+    def get_snapshot_indices(self, ticker_any_of=None):
+        if self.raise_on.get("get_snapshot_indices"):
+            raise self.raise_on["get_snapshot_indices"]
+        closes = {"I:VIX9D": 42.0, "I:VIX": 44.0, "I:VIX3M": 46.0}
+        return [
+            SimpleNamespace(
+                ticker=ticker,
+                session=SimpleNamespace(previous_close=closes[ticker]),
+            )
+            for ticker in ticker_any_of
+        ]
+
     def close(self):
         self.closed = True
 
@@ -78,7 +90,13 @@ async def test_market_data_failure(monkeypatch):
     error = RuntimeError("boom")
 
     def _factory(*args, **kwargs):
-        return _FakeRESTClient(raise_on={"list_aggs": error, "get_previous_close_agg": error})
+        return _FakeRESTClient(
+            raise_on={
+                "list_aggs": error,
+                "get_previous_close_agg": error,
+                "get_snapshot_indices": error,
+            }
+        )
 
     monkeypatch.setattr("engine.providers.massive_provider.RESTClient", _factory)
 
@@ -92,3 +110,114 @@ async def test_market_data_failure(monkeypatch):
 
     diag = market.diagnostics()
     assert diag["error_rate"]["failure"] > 0
+
+
+@pytest.mark.anyio("asyncio")
+async def test_vix_term_falls_back_to_previous_closes():
+    from massive.exceptions import AuthError
+
+    market = MassiveMarketData(api_key="fake")
+    assert await market.get_vix_term() == {"^VIX9D": 42.0, "^VIX": 44.0, "^VIX3M": 46.0}
+    assert market.diagnostics()["error_rate"]["success"] == 1
+
+    market._client.raise_on["get_snapshot_indices"] = AuthError("not entitled")
+    assert await market.get_vix_term() == {"^VIX9D": 42.0, "^VIX": 44.0, "^VIX3M": 46.0}
+    assert market._vix_snapshot is False
+    # Later calls skip the snapshot and go straight to the three legs.
+    await market.get_vix_term()
+    assert market.diagnostics()["error_rate"]["failure"] == 1
+
+
+@pytest.mark.anyio("asyncio")
+async def test_vix_term_skips_incomplete_snapshot_for_cooldown(monkeypatch):
+    market = MassiveMarketData(api_key="fake")
+    calls = []
+
+    def _partial_snapshot(ticker_any_of=None):
+        calls.append(ticker_any_of)
+        return [SimpleNamespace(ticker="I:VIX", session=None)]
+
+    market._client.get_snapshot_indices = _partial_snapshot
+    expected = {"^VIX9D": 42.0, "^VIX": 44.0, "^VIX3M": 46.0}
+    assert await market.get_vix_term() == expected
+    assert await market.get_vix_term() == expected
+    assert len(calls) == 1
+    assert market._vix_snapshot is True
+
+    # Once the cooldown lapses the snapshot is tried again.
+    market._vix_snapshot_retry_at = 0.0
+    await market.get_vix_term()
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio("asyncio")
+async def test_retries_back_off_on_the_event_loop(monkeypatch):
+    delays = []
+
+    async def _fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("engine.providers.massive_provider.asyncio.sleep", _fake_sleep)
+    # Full jitter draws from [0, backoff]; take the upper bound.
+    monkeypatch.setattr(
+        "engine.providers.massive_provider.random.uniform", lambda low, high: high
+    )
+
+    market = MassiveMarketData(api_key="fake", retries=2)
+    market._client.raise_on["get_previous_close_agg"] = RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        await market.get_last_price("SPY")
+
+    assert delays == [0.25, 0.5]
+    assert market.diagnostics()["error_rate"]["failure"] == 3
+
+
+@pytest.mark.anyio("asyncio")
+async def test_bad_responses_are_not_retried():
+    from massive.exceptions import BadResponse
+
+    market = MassiveMarketData(api_key="fake", retries=3)
+    market._client.raise_on["list_aggs"] = BadResponse('{"status":"NOT_FOUND"}')
+    with pytest.raises(BadResponse):
+        await market.get_ohlc("NOPE")
+
+    assert market.diagnostics()["error_rate"]["failure"] == 1
+
+
+@pytest.mark.anyio("asyncio")
+async def test_circuit_breaker_fails_fast_after_repeated_failures():
+    from engine.providers.massive_provider import ProviderUnavailableError
+
+    market = MassiveMarketData(api_key="fake", retries=0)
+    market._client.raise_on["get_previous_close_agg"] = RuntimeError("boom")
+    for _ in range(5):
+        with pytest.raises(RuntimeError):
+            await market.get_last_price("SPY")
+
+    market._client.raise_on.clear()
+    with pytest.raises(ProviderUnavailableError):
+        await market.get_last_price("SPY")
+    assert market.diagnostics()["circuit_open"] is True
+    assert market.diagnostics()["error_rate"]["failure"] == 5
+
+    market._breaker_open_until = 0.0
+    assert await market.get_last_price("SPY") == pytest.approx(46.0)
+    assert market._consecutive_failures == 0
+
+
+@pytest.mark.anyio("asyncio")
+async def test_token_bucket_paces_on_the_event_loop(monkeypatch):
+    from engine.providers.massive_provider import AsyncTokenBucket
+
+    delays = []
+
+    async def _fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("engine.providers.massive_provider.asyncio.sleep", _fake_sleep)
+
+    bucket = AsyncTokenBucket(rate=0.5)
+    for _ in range(3):
+        await bucket.acquire()
+
+    assert delays == [pytest.approx(2.0, abs=0.01)] * 2
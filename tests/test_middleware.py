@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pytest
+
+from app import middleware
+from app.middleware import RateLimiter
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(middleware.time, "monotonic", fake)
+    return fake
+
+
+def test_rate_limiter_blocks_after_limit_and_resets(clock: _Clock):
+    limiter = RateLimiter(requests_per_minute=3)
+
+    allowed = [limiter.is_allowed("1.1.1.1") for _ in range(4)]
+    assert allowed == [True, True, True, False]
+    # Other clients have their own window.
+    assert limiter.is_allowed("2.2.2.2")
+
+    clock.now += 60
+    assert limiter.is_allowed("1.1.1.1")
+
+
+def test_rate_limiter_collects_stale_and_excess_ips(clock: _Clock):
+    limiter = RateLimiter(requests_per_minute=5, max_ips=2 * RateLimiter.shard_count)
+    limiter.gc_interval = 1_000_000
+    # Route every client to one shard so its per-shard capacity (2) is exercised.
+    limiter._shard_mask = 0
+
+    limiter.is_allowed("old")
+    clock.now += 61
+    limiter.is_allowed("a")
+    clock.now += 1
+    limiter.is_allowed("b")
+    clock.now += 1
+    # At capacity: each new client evicts the oldest window, expired ones first.
+    limiter.is_allowed("c")
+    assert set(limiter.shards[0]) == {"b", "c"}
+    limiter.is_allowed("d")
+
+    assert set(limiter.shards[0]) == {"c", "d"}
+    assert len(limiter.shards[0]) <= limiter._shard_max_ips
+
+
+def test_rate_limiter_sweeps_expired_windows_on_gc_interval(clock: _Clock):
+    limiter = RateLimiter(requests_per_minute=5)
+    limiter.gc_interval = 3
+
+    limiter.is_allowed("old")
+    clock.now += 61
+    limiter.is_allowed("new")
+    assert len(limiter) == 2
+    limiter.is_allowed("new")
+
+    assert len(limiter) == 1
+
+
+def test_full_shard_does_not_collect_for_known_clients(clock: _Clock, monkeypatch):
+    limiter = RateLimiter(requests_per_minute=100, max_ips=2 * RateLimiter.shard_count)
+    limiter.gc_interval = 1_000_000
+    limiter._shard_mask = 0
+    collected = []
+    monkeypatch.setattr(limiter, "_collect", lambda *args: collected.append(args))
+
+    limiter.is_allowed("a")
+    limiter.is_allowed("b")
+    for _ in range(10):
+        assert limiter.is_allowed("a")
+
+    assert collected == []
+    assert len(limiter.shards[0]) == limiter._shard_max_ips